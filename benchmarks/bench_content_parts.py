@@ -0,0 +1,67 @@
+# benchmarks/bench_content_parts.py
+"""Content part tokenizer on multi-megabyte contents embedding base64 data URLs.
+
+Usage: python benchmarks/bench_content_parts.py [--number 20]
+"""
+import argparse
+import os
+import timeit
+import typing
+
+import durl
+
+from str_message import CONTENT_IMAGE_URL_EXPR
+from str_message.utils.content_parts_from_str import (
+    content_part_spans_from_str,
+    content_parts_from_str,
+)
+
+
+def build_image_content(images: int, image_size: int) -> str:
+    parts: typing.List[str] = ["What is the difference between these images?"]
+    for idx in range(images):
+        data_url = durl.DataURL.from_data(
+            durl.MIMEType.JPEG_IMAGES, os.urandom(image_size)
+        )
+        parts.append(f"Image {idx}:")
+        parts.append(CONTENT_IMAGE_URL_EXPR.format(image_url=data_url))
+    return "\n\n".join(parts)
+
+
+def build_text_content(lines: int) -> str:
+    parts = [f"Line {idx} of a long text message." for idx in range(lines)]
+    parts.append(CONTENT_IMAGE_URL_EXPR.format(image_url="https://example.com"))
+    return "\n\n".join(parts)
+
+
+def _per_call_ms(func: typing.Callable[[], typing.Any], number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=20)
+    args = parser.parse_args()
+
+    contents: typing.Dict[str, str] = {
+        "1 x 512 KiB image": build_image_content(1, 512 * 1024),
+        "4 x 512 KiB images": build_image_content(4, 512 * 1024),
+        "4 x 2 MiB images": build_image_content(4, 2 * 1024**2),
+        "2000 text lines, 1 image url": build_text_content(2000),
+    }
+
+    print(f"{'content':<30} {'size':>10} {'parts':>6} {'spans':>10} {'parts':>10}")
+    for name, content in contents.items():
+        spans_ms = _per_call_ms(
+            lambda: content_part_spans_from_str(content), args.number
+        )
+        parts_ms = _per_call_ms(lambda: content_parts_from_str(content), args.number)
+        print(
+            f"{name:<30} {len(content) / 1024**2:>8.2f}MB "
+            + f"{len(content_part_spans_from_str(content)):>6} "
+            + f"{spans_ms:>8.3f}ms {parts_ms:>8.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# benchmarks/bench_import_time.py
+"""Cold import time of `str_message`, measured with `python -X importtime`.
+
+Usage: python benchmarks/bench_import_time.py [--repeat 5] [--top 15] [--max-ms 0]
+"""
+import argparse
+import pathlib
+import statistics
+import subprocess
+import sys
+import typing
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+# Heavy dependencies that must only be imported on first use
+LAZY_MODULES = ("agents", "jinja2", "openai_usage", "str_message._adapters")
+
+
+def import_times(statement: str) -> typing.Dict[str, typing.Tuple[int, int]]:
+    """Return module name to (self, cumulative) import time in microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: typing.Dict[str, typing.Tuple[int, int]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--max-ms", type=float, default=0, help="Fail above this median, 0 to skip"
+    )
+    args = parser.parse_args()
+
+    runs = [import_times("import str_message") for _ in range(args.repeat)]
+    totals_ms = [run["str_message"][1] / 1e3 for run in runs]
+    median_ms = statistics.median(totals_ms)
+
+    print(f"import str_message: median {median_ms:.1f}ms, min {min(totals_ms):.1f}ms")
+    print(f"{'module':<60} {'cumulative':>12}")
+    top_level = sorted(runs[-1].items(), key=lambda item: item[1][1], reverse=True)[
+        : args.top
+    ]
+    for name, (_, cumulative_us) in top_level:
+        print(f"{name:<60} {cumulative_us / 1e3:>10.1f}ms")
+
+    failed = False
+    if loaded := [name for name in LAZY_MODULES if name in runs[-1]]:
+        print(f"Eagerly imported: {', '.join(loaded)}")
+        failed = True
+    if args.max_ms and median_ms > args.max_ms:
+        print(f"Import time {median_ms:.1f}ms is above {args.max_ms:.1f}ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
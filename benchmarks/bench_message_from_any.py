@@ -0,0 +1,152 @@
+# benchmarks/bench_message_from_any.py
+"""Per-item latency of `message_from_any` for every supported dict shape,
+and for the same items passed as SDK model instances.
+
+Usage: python benchmarks/bench_message_from_any.py [--number 2000]
+"""
+import argparse
+import logging
+import timeit
+import typing
+
+import str_message.patches.patch_openai
+from str_message import ResponseInputItemAdapter
+from str_message.utils.message_from_any import (
+    _message_from_dict_cascade,
+    dict_discriminator,
+    message_from_any,
+    message_from_dict,
+)
+
+str_message.patches.patch_openai.patch_openai()
+
+SHAPES: typing.Dict[str, typing.Dict[str, typing.Any]] = {
+    "chat_cmpl": {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 1,
+        "model": "gpt-4o-mini",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "Hello!"},
+            }
+        ],
+    },
+    "chat_cmpl_message": {"role": "assistant", "content": "Hello!"},
+    "chat_cmpl_message_tool_call": {
+        "role": "assistant",
+        "content": None,
+        "tool_calls": [
+            {
+                "id": "call_1",
+                "type": "function",
+                "function": {"name": "get_current_time", "arguments": "{}"},
+            }
+        ],
+    },
+    "chat_cmpl_input_user": {"role": "user", "content": "Hello!"},
+    "chat_cmpl_input_system": {"role": "system", "content": "Be nice."},
+    "chat_cmpl_input_developer": {"role": "developer", "content": "Be nice."},
+    "response_easy_input_message": {
+        "type": "message",
+        "role": "user",
+        "content": "Hello!",
+    },
+    "response_input_message_parts": {
+        "role": "user",
+        "content": [{"type": "input_text", "text": "Hello!"}],
+    },
+    "response_output_message": {
+        "id": "msg_1",
+        "type": "message",
+        "role": "assistant",
+        "status": "completed",
+        "content": [{"type": "output_text", "text": "Hello!", "annotations": []}],
+    },
+    "response_function_call": {
+        "id": "fc_1",
+        "type": "function_call",
+        "call_id": "call_2",
+        "name": "get_current_time",
+        "arguments": "{}",
+    },
+    "response_function_call_output": {
+        "type": "function_call_output",
+        "call_id": "call_2",
+        "output": "2025-01-01T00:00:00+09:00",
+    },
+    "response_reasoning": {
+        "id": "rs_1",
+        "type": "reasoning",
+        "summary": [{"type": "summary_text", "text": "Thinking..."}],
+    },
+    "response_mcp_list_tools": {
+        "id": "mcpl_1",
+        "type": "mcp_list_tools",
+        "server_label": "aws-knowledge-mcp-server",
+        "tools": [{"name": "search_documentation", "input_schema": {}}],
+    },
+    "response_mcp_call": {
+        "id": "mcp_1",
+        "type": "mcp_call",
+        "server_label": "aws-knowledge-mcp-server",
+        "name": "search_documentation",
+        "arguments": "{}",
+        "output": "S3 is an object storage service.",
+    },
+    "response_web_search_call": {
+        "id": "ws_1",
+        "type": "web_search_call",
+        "status": "completed",
+        "action": {"type": "search", "query": "weather in Tokyo"},
+    },
+}
+
+
+def _per_item_us(func: typing.Callable[[], typing.Any], number: int) -> float:
+    try:
+        func()
+    except Exception:
+        return float("nan")
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)  # Tool call tracing logs every item
+
+    print(f"{'shape':<32} {'discriminator':<34} {'dispatch':>10} {'cascade':>10}")
+    for name, data in SHAPES.items():
+        dispatch_us = _per_item_us(lambda: message_from_dict(data), args.number)
+        cascade_us = _per_item_us(lambda: _message_from_dict_cascade(data), args.number)
+        print(
+            f"{name:<32} {str(dict_discriminator(data)):<34} "
+            + f"{dispatch_us:>8.2f}us {cascade_us:>8.2f}us"
+        )
+
+    print("")
+    print(f"{'model':<32} {'class':<34} {'direct':>10} {'json trip':>10}")
+    for name, data in SHAPES.items():
+        if not name.startswith("response_") or "type" not in data:
+            continue
+        model = ResponseInputItemAdapter.validate_python(data)
+        direct_us = _per_item_us(lambda: message_from_any(model), args.number)
+        json_trip_us = _per_item_us(
+            lambda: message_from_any(
+                ResponseInputItemAdapter.validate_json(model.model_dump_json())
+            ),
+            args.number,
+        )
+        print(
+            f"{name:<32} {type(model).__name__:<34} "
+            + f"{direct_us:>8.2f}us {json_trip_us:>8.2f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_tool_call_registry.py
+"""Tool call registry throughput with concurrent worker threads.
+
+Each worker sets and gets its own call ids, compared between the sharded
+registry and a single TTL cache behind one global lock.
+
+Usage: python benchmarks/bench_tool_call_registry.py [--ops 20000] [--workers 1 2 4 8]
+"""
+import argparse
+import threading
+import time
+import typing
+
+from openai.types.responses.response_function_tool_call import ResponseFunctionToolCall
+
+from str_message.types.tool_call_registry import (
+    ShardedToolCallRegistry,
+    ToolCall,
+    ToolCallRegistry,
+    TTLToolCallRegistry,
+)
+
+
+class GlobalLockToolCallRegistry(TTLToolCallRegistry):
+    """Baseline, every access waits on the same lock."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+
+    def get(self, call_id: str) -> ToolCall | None:
+        with self._lock:
+            return super().get(call_id)
+
+    def set(self, call_id: str, tool_call: ToolCall) -> None:
+        with self._lock:
+            super().set(call_id, tool_call)
+
+
+def run(registry: ToolCallRegistry, workers: int, ops: int) -> float:
+    """Return the total set + get operations per second over all workers."""
+    tool_call = ResponseFunctionToolCall(
+        call_id="call", name="get_weather", arguments="{}", type="function_call"
+    )
+    barrier = threading.Barrier(workers + 1)
+
+    def work(worker: int):
+        call_ids = [f"call_{worker}_{idx}" for idx in range(ops)]
+        barrier.wait()
+        for call_id in call_ids:
+            registry.set(call_id, tool_call)
+            registry.get(call_id)
+
+    threads = [threading.Thread(target=work, args=(idx,)) for idx in range(workers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return workers * ops * 2 / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--shards", type=int, default=16)
+    args = parser.parse_args()
+
+    maxsize = max(args.workers) * args.ops
+    registries: typing.Dict[str, typing.Callable[[], ToolCallRegistry]] = {
+        "global lock": lambda: GlobalLockToolCallRegistry(maxsize=maxsize),
+        f"sharded x{args.shards}": lambda: ShardedToolCallRegistry(
+            maxsize=maxsize, shards=args.shards
+        ),
+    }
+
+    print(f"{'registry':<15} {'workers':>8} {'ops/s':>12} {'scaling':>8}")
+    for name, factory in registries.items():
+        single: float | None = None
+        for workers in args.workers:
+            ops_per_sec = run(factory(), workers, args.ops)
+            single = single or ops_per_sec
+            print(
+                f"{name:<15} {workers:>8} {ops_per_sec:>12,.0f} "
+                + f"{ops_per_sec / single:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
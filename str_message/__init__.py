@@ -1,5 +1,7 @@
 # str_message/__init__.py
+import importlib
 import pathlib
+import typing
 
 from ._message import (
     ALL_CONTENT_TYPES,
@@ -24,24 +26,38 @@ from ._message import (
     AssistantMessage,
     ContentPart,
     ContentParts,
-    Conversation,
     DeveloperMessage,
-    ListFuncDefAdapter,
     McpCallMessage,
     McpListToolsMessage,
     Message,
     MessageTypes,
-    ParsedResponseOutputItemAdapter,
     ReasoningMessage,
-    ResponseInputItemAdapter,
     ResponseInputItemModels,
-    ResponseOutputItemAdapter,
+    ResponseOutputItemModels,
     SystemMessage,
     ToolCallMessage,
     ToolCallOutputMessage,
     UserMessage,
 )
 
+if typing.TYPE_CHECKING:
+    from ._adapters import (
+        ListFuncDefAdapter,
+        ParsedResponseOutputItemAdapter,
+        ResponseInputItemAdapter,
+        ResponseOutputItemAdapter,
+    )
+    from ._conversation import Conversation
+
+# Loaded on first access, these pull in `agents` and build large type adapters
+_LAZY_IMPORTS: typing.Dict[str, str] = {
+    "Conversation": "._conversation",
+    "ListFuncDefAdapter": "._adapters",
+    "ParsedResponseOutputItemAdapter": "._adapters",
+    "ResponseInputItemAdapter": "._adapters",
+    "ResponseOutputItemAdapter": "._adapters",
+}
+
 __version__ = pathlib.Path(__file__).parent.joinpath("VERSION").read_text().strip()
 
 __all__ = [
@@ -82,8 +98,21 @@ __all__ = [
     "ResponseInputItemAdapter",
     "ResponseInputItemModels",
     "ResponseOutputItemAdapter",
+    "ResponseOutputItemModels",
     "SystemMessage",
     "ToolCallMessage",
     "ToolCallOutputMessage",
     "UserMessage",
 ]
+
+
+def __getattr__(name: str) -> typing.Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> typing.List[str]:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
@@ -0,0 +1,16 @@
+import typing
+
+import pydantic
+from openai.types.responses.parsed_response import ParsedResponseOutputItem
+from openai.types.responses.response_input_item import ResponseInputItem
+from openai.types.responses.response_output_item import ResponseOutputItem
+from openai.types.shared.function_definition import FunctionDefinition
+
+ListFuncDefAdapter = pydantic.TypeAdapter[typing.List[FunctionDefinition]](
+    typing.List[FunctionDefinition]
+)
+ResponseInputItemAdapter = pydantic.TypeAdapter[ResponseInputItem](ResponseInputItem)
+ResponseOutputItemAdapter = pydantic.TypeAdapter[ResponseOutputItem](ResponseOutputItem)
+ParsedResponseOutputItemAdapter = pydantic.TypeAdapter[ParsedResponseOutputItem](
+    ParsedResponseOutputItem
+)
@@ -0,0 +1,292 @@
+import contextlib
+import logging
+import typing
+
+import agents
+import openai_usage
+import pydantic
+import uuid_utils as uuid
+from openai.types.chat.chat_completion_message_param import ChatCompletionMessageParam
+from openai.types.completion_usage import CompletionUsage
+from openai.types.responses.response_input_param import ResponseInputParam
+from openai.types.responses.response_usage import ResponseUsage
+
+from str_message._message import (
+    McpCallMessage,
+    Message,
+    MessageTypes,
+    MessageTypesList,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+)
+
+if typing.TYPE_CHECKING:
+    import tiktoken
+
+    from str_message.types.message_indexes import MessageIndexes
+    from str_message.types.messages_params_cache import MessagesParamsCache
+    from str_message.types.tool_call_registry import ToolCallRegistry
+    from str_message.utils.ensure_reasoning_following_items import (
+        ReasoningRemovalReport,
+    )
+    from str_message.utils.messages_fit_to_budget import FitToBudgetStrategy
+
+logger = logging.getLogger(__name__)
+
+
+class Conversation(pydantic.BaseModel):
+    id: str = pydantic.Field(default_factory=lambda: str(uuid.uuid7()))
+    messages: MessageTypesList = pydantic.Field(default_factory=list)
+    usages: typing.List[openai_usage.Usage] = pydantic.Field(default_factory=list)
+
+    token_encoding: typing.ClassVar[str] = "o200k_base"
+
+    def __getstate__(self) -> typing.Dict[typing.Any, typing.Any]:
+        # Caches are rebuilt on use, and their converters are closures that
+        # can not be pickled
+        state = super().__getstate__()
+        state["__dict__"] = {
+            key: value
+            for key, value in state["__dict__"].items()
+            if key not in ("_messages_params_caches", "_message_indexes")
+        }
+        return state
+
+    @property
+    def total_cost(self) -> str:
+        import decimal
+
+        total_cost = decimal.Decimal(0)
+        for usage in self.usages:
+            if usage.cost:
+                total_cost += decimal.Decimal(usage.cost)
+        return total_cost.to_eng_string()
+
+    @property
+    def chat_cmpl_messages(self) -> list[ChatCompletionMessageParam]:
+        """Messages as chat completion params, only new or edited ones are converted."""
+        from str_message.utils.messages_to_chat_cmpl_input_messages import (
+            messages_gen_chat_cmpl_input_messages,
+        )
+
+        return self._messages_params_cache(
+            "chat_cmpl_messages",
+            lambda message: messages_gen_chat_cmpl_input_messages([message]),
+        ).get(self.messages)
+
+    @property
+    def response_input_param(self) -> ResponseInputParam:
+        return self.to_response_input_param()
+
+    def to_response_input_param(
+        self, *, ignore_reasoning: bool = False
+    ) -> ResponseInputParam:
+        """Messages as response input items, only new or edited ones are converted."""
+        from str_message.utils.messages_to_response_input_param import (
+            messages_gen_response_input_param,
+        )
+
+        return self._messages_params_cache(
+            (
+                "response_input_param:ignore_reasoning"
+                if ignore_reasoning
+                else "response_input_param"
+            ),
+            lambda message: messages_gen_response_input_param(
+                [message], ignore_reasoning=ignore_reasoning
+            ),
+        ).get(self.messages)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(self.token_counts())
+
+    def token_counts(
+        self, *, encoding: typing.Union["tiktoken.Encoding", str, None] = None
+    ) -> typing.List[int]:
+        """Estimated tokens of each message, only new or edited ones are counted."""
+        from str_message.utils.message_token_count import (
+            get_token_encoding,
+            message_token_count,
+        )
+
+        _encoding = get_token_encoding(encoding or self.token_encoding)
+        return self._messages_params_cache(
+            f"token_counts:{_encoding.name}",
+            lambda message: [message_token_count(message, _encoding)],
+        ).get(self.messages)
+
+    def fit_to_budget(
+        self,
+        max_tokens: int,
+        *,
+        strategy: "FitToBudgetStrategy" = "drop_oldest",
+        summarize: (
+            typing.Callable[[typing.List[MessageTypes]], MessageTypes | str] | None
+        ) = None,
+        encoding: typing.Union["tiktoken.Encoding", str, None] = None,
+    ) -> typing.List[MessageTypes]:
+        """Drop, or summarize, the oldest turns until the messages take at most
+        `max_tokens` tokens. Returns the removed messages. The summary is added
+        as a user message after the instructions, later calls pass it to
+        `summarize` with the turns dropped next and replace it.
+        """
+        from str_message.utils.message_token_count import (
+            get_token_encoding,
+            message_token_count,
+        )
+        from str_message.utils.messages_fit_to_budget import messages_fit_to_budget
+
+        _encoding = get_token_encoding(encoding or self.token_encoding)
+        kept, removed = messages_fit_to_budget(
+            self.messages,
+            self.token_counts(encoding=_encoding),
+            max_tokens,
+            strategy=strategy,
+            summarize=summarize,
+            token_count=lambda message: message_token_count(message, _encoding),
+        )
+        self.messages[:] = kept
+        self.reindex()
+        return removed
+
+    def _messages_params_cache(
+        self,
+        key: str,
+        convert: typing.Callable[[Message], typing.Iterable[typing.Any]],
+    ) -> "MessagesParamsCache":
+        from str_message.types.messages_params_cache import MessagesParamsCache
+
+        # Kept out of the model fields like `functools.cached_property`
+        caches: typing.Dict[str, MessagesParamsCache] = self.__dict__.setdefault(
+            "_messages_params_caches", {}
+        )
+        if key not in caches:
+            caches[key] = MessagesParamsCache(convert)
+        return caches[key]
+
+    def add_message(
+        self,
+        message: MessageTypes | typing.List[MessageTypes],
+        *,
+        ensure_reasoning: bool = False,
+    ) -> None:
+        """Append messages, with `ensure_reasoning` reasoning messages without
+        their following item are removed as the added messages are checked.
+        """
+        start = len(self.messages)
+        if isinstance(message, typing.List):
+            self.messages.extend(message)
+        else:
+            self.messages.append(message)
+        if (indexes := self.__dict__.get("_message_indexes")) is not None:
+            indexes.extend_from(self.messages, start)
+
+        if ensure_reasoning:
+            from str_message.utils.ensure_reasoning_following_items import (
+                ensure_reasoning_following_items,
+            )
+
+            # Only the previous last message gets a new following item
+            if ensure_reasoning_following_items(
+                self.messages, start=max(start - 1, 0), keep_trailing=True
+            ):
+                self.reindex()
+
+    def get_message(self, message_id: str) -> MessageTypes | None:
+        return self._get_message_indexes().by_id.get(message_id)
+
+    def tool_call_for(self, call_id: str) -> ToolCallMessage | None:
+        return self._get_message_indexes().tool_calls.get(call_id)
+
+    def output_for(self, call_id: str) -> ToolCallOutputMessage | None:
+        """The output of the tool call, None while the call is pending."""
+        return self._get_message_indexes().tool_call_outputs.get(call_id)
+
+    def mcp_call_for(self, mcp_call_id: str) -> McpCallMessage | None:
+        return self._get_message_indexes().mcp_calls.get(mcp_call_id)
+
+    def pending_tool_calls(self) -> typing.List[ToolCallMessage]:
+        """Tool calls without an output yet, in the order they were added."""
+        return list(self._get_message_indexes().pending_tool_calls.values())
+
+    def reindex(self) -> None:
+        """Rebuild the message lookups on their next use. Needed after messages
+        are replaced in place, e.g. `conv.messages[0] = message`.
+        """
+        if (indexes := self.__dict__.get("_message_indexes")) is not None:
+            indexes.clear()
+
+    def _get_message_indexes(self) -> "MessageIndexes":
+        from str_message.types.message_indexes import MessageIndexes
+
+        # Kept out of the model fields like `functools.cached_property`
+        indexes: MessageIndexes | None = self.__dict__.get("_message_indexes")
+        if indexes is None:
+            indexes = self.__dict__["_message_indexes"] = MessageIndexes()
+        indexes.sync(self.messages)
+        return indexes
+
+    @property
+    def tool_call_registry(self) -> "ToolCallRegistry":
+        """Tool calls seen by this conversation, kept apart from other sessions."""
+        from str_message.types.tool_call_registry import TTLToolCallRegistry
+
+        registry: ToolCallRegistry | None = self.__dict__.get("_tool_call_registry")
+        if registry is None:
+            registry = self.__dict__["_tool_call_registry"] = TTLToolCallRegistry()
+        return registry
+
+    def set_tool_call_registry(self, registry: "ToolCallRegistry") -> None:
+        self.__dict__["_tool_call_registry"] = registry
+
+    @contextlib.contextmanager
+    def tool_call_scope(self) -> typing.Generator["ToolCallRegistry", None, None]:
+        """Convert messages within the block against this conversation's
+        tool call registry instead of the process default.
+        """
+        from str_message.types.tool_call_registry import use_tool_call_registry
+
+        with use_tool_call_registry(self.tool_call_registry) as registry:
+            yield registry
+
+    def add_usage(
+        self,
+        usage: (
+            openai_usage.Usage
+            | ResponseUsage
+            | agents.RunContextWrapper
+            | agents.Usage
+            | CompletionUsage
+        ),
+        *,
+        model: typing.Optional[str] = None,
+        annotations: typing.Optional[str] = None,
+    ) -> None:
+        if isinstance(usage, openai_usage.Usage):
+            valid_usage = openai_usage.Usage.model_validate_json(
+                usage.model_dump_json()
+            )
+        else:
+            valid_usage = openai_usage.Usage.from_openai(usage)
+
+        if model:
+            valid_usage.model = model
+            valid_usage.cost = valid_usage.estimate_cost_str()
+        else:
+            logger.warning(f"Can not find model '{model}' card")
+
+        if annotations:
+            valid_usage.annotations = annotations
+
+        self.usages.append(valid_usage)
+
+    def clean_messages(self) -> "ReasoningRemovalReport":
+        from str_message.utils.ensure_reasoning_following_items import (
+            ensure_reasoning_following_items,
+        )
+
+        report = ensure_reasoning_following_items(self.messages)
+        if report:
+            self.reindex()
+        return report
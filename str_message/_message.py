@@ -6,11 +6,7 @@ import time
 import typing
 import zoneinfo
 
-import agents
-import cachetools
 import durl
-import jinja2
-import openai_usage
 import pydantic
 import uuid_utils as uuid
 from openai.types.chat.chat_completion import ChatCompletion
@@ -21,7 +17,6 @@ from openai.types.chat.chat_completion_message import (
     FunctionCall as ChatCompletionFunctionCall,
 )
 from openai.types.chat.chat_completion_message_param import ChatCompletionMessageParam
-from openai.types.completion_usage import CompletionUsage
 from openai.types.responses.easy_input_message import EasyInputMessage
 from openai.types.responses.parsed_response import ParsedResponseOutputItem
 from openai.types.responses.response_code_interpreter_tool_call import (
@@ -59,17 +54,26 @@ from openai.types.responses.response_input_item import (
 )
 from openai.types.responses.response_input_item_param import ResponseInputItemParam
 from openai.types.responses.response_input_param import ResponseInputParam
+from openai.types.responses.response_output_item import (
+    ImageGenerationCall as ResponseOutputImageGenerationCall,
+)
+from openai.types.responses.response_output_item import (
+    LocalShellCall as ResponseOutputLocalShellCall,
+)
+from openai.types.responses.response_output_item import (
+    McpApprovalRequest as ResponseOutputMcpApprovalRequest,
+)
+from openai.types.responses.response_output_item import McpCall as ResponseOutputMcpCall
+from openai.types.responses.response_output_item import (
+    McpListTools as ResponseOutputMcpListTools,
+)
 from openai.types.responses.response_output_item import (
     McpListToolsTool,
     ResponseOutputItem,
 )
 from openai.types.responses.response_output_message import ResponseOutputMessage
 from openai.types.responses.response_reasoning_item import ResponseReasoningItem
-from openai.types.responses.response_usage import (
-    ResponseUsage,
-)
 from openai.types.shared.function_definition import FunctionDefinition
-from rich.pretty import pretty_repr
 
 logger = logging.getLogger(__name__)
 
@@ -89,9 +93,6 @@ ANY_MESSAGE_TYPES: typing.TypeAlias = typing.Union[
     OPENAI_MESSAGE_PARAM_TYPES,
     OPENAI_MESSAGE_TYPES,
 ]
-ListFuncDefAdapter = pydantic.TypeAdapter[typing.List[FunctionDefinition]](
-    typing.List[FunctionDefinition]
-)
 ResponseInputItemModels = (
     EasyInputMessage,
     ResponseInputItemMessage,
@@ -115,10 +116,20 @@ ResponseInputItemModels = (
     ResponseCustomToolCall,
     ItemReference,
 )
-ResponseInputItemAdapter = pydantic.TypeAdapter[ResponseInputItem](ResponseInputItem)
-ResponseOutputItemAdapter = pydantic.TypeAdapter[ResponseOutputItem](ResponseOutputItem)
-ParsedResponseOutputItemAdapter = pydantic.TypeAdapter[ParsedResponseOutputItem](
-    ParsedResponseOutputItem
+ResponseOutputItemModels = (
+    ResponseOutputMessage,
+    ResponseFileSearchToolCall,
+    ResponseFunctionToolCall,
+    ResponseFunctionWebSearch,
+    ResponseComputerToolCall,
+    ResponseReasoningItem,
+    ResponseOutputImageGenerationCall,
+    ResponseCodeInterpreterToolCall,
+    ResponseOutputLocalShellCall,
+    ResponseOutputMcpCall,
+    ResponseOutputMcpListTools,
+    ResponseOutputMcpApprovalRequest,
+    ResponseCustomToolCall,
 )
 
 CONTENT_TYPE: typing.TypeAlias = typing.Union[
@@ -204,13 +215,6 @@ class MessageUtils(abc.ABC):
     created_at: int
     metadata: typing.Optional[typing.Dict[str, str]]
 
-    # Class variables
-    _call_id_to_tool_calls: cachetools.TTLCache[
-        str, ChatCompletionFunctionCall | ResponseFunctionToolCall
-    ] = cachetools.TTLCache(
-        maxsize=1000, ttl=60 * 60  # 1 hour
-    )
-
     @classmethod
     def from_any(
         cls,
@@ -229,6 +233,8 @@ class MessageUtils(abc.ABC):
 
         final = message_from_any(data)
         if verbose:
+            from rich.pretty import pretty_repr
+
             raw_repr = pretty_repr(data, indent_size=0, max_string=16).replace("\n", "")
             final_repr = pretty_repr(final, indent_size=0, max_string=16).replace(
                 "\n", ""
@@ -236,6 +242,21 @@ class MessageUtils(abc.ABC):
             logger.debug(f"Message from {raw_repr} to {final_repr}")
         return final
 
+    @classmethod
+    def from_many(
+        cls,
+        data: typing.Iterable[
+            ANY_MESSAGE_TYPES
+            | ChatCompletion
+            | ResponseOutputItem
+            | ParsedResponseOutputItem
+        ],
+    ) -> typing.List["MessageTypes"]:
+        """Create messages from many items, batching validation by shape."""
+        from str_message.utils.messages_from_many import messages_from_many
+
+        return messages_from_many(data)
+
     @classmethod
     def to_chat_cmpl_input_messages(
         cls, messages: typing.Union[list["Message"], "Message"]
@@ -278,30 +299,11 @@ class MessageUtils(abc.ABC):
         To solve OpenAI error: Item 'rs_xxx' of type 'reasoning' was provided
         without its required following item.
         """
-        if not messages:
-            return messages
-
-        remove_ids: list[str] = []
-
-        for idx, msg in enumerate(messages):
-            if isinstance(msg, ReasoningMessage):
-                if len(messages) < idx + 1:
-                    logger.warning(
-                        f"Removing reasoning message {msg.id} "
-                        + "because it is the last message"
-                    )
-                    remove_ids.append(msg.id)
-                    continue
-                # Must be before assistant message else remove it
-                if not isinstance(messages[idx + 1], AssistantMessage):
-                    logger.warning(
-                        f"Removing reasoning message {msg.id} "
-                        + "because it is not with correct following item"
-                    )
-                    remove_ids.append(msg.id)
-                    continue
-
-        messages[:] = [msg for msg in messages if msg.id not in remove_ids]
+        from str_message.utils.ensure_reasoning_following_items import (
+            ensure_reasoning_following_items,
+        )
+
+        ensure_reasoning_following_items(messages)
         return messages
 
     @classmethod
@@ -310,16 +312,25 @@ class MessageUtils(abc.ABC):
         call_id: str,
         tool_call: ChatCompletionFunctionCall | ResponseFunctionToolCall,
     ) -> None:
-        logger.info(
-            f"Setting tool call '{call_id}' with value: {tool_call.model_dump_json()}"
-        )
-        cls._call_id_to_tool_calls[call_id] = tool_call
+        """Remember the tool call in the active registry.
+        See `use_tool_call_registry` to scope the registry.
+        """
+        from str_message.types.tool_call_registry import get_tool_call_registry
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                f"Setting tool call '{call_id}' with value: "
+                + f"{tool_call.model_dump_json()}"
+            )
+        get_tool_call_registry().set(call_id, tool_call)
 
     @classmethod
     def get_tool_call(
         cls, call_id: str
     ) -> ChatCompletionFunctionCall | ResponseFunctionToolCall | None:
-        might_tool_call = cls._call_id_to_tool_calls.get(call_id)
+        from str_message.types.tool_call_registry import get_tool_call_registry
+
+        might_tool_call = get_tool_call_registry().get(call_id)
         if might_tool_call is None:
             logger.warning(f"Tool call '{call_id}' not found! Please set it first!")
             return None
@@ -351,6 +362,19 @@ class MessageUtils(abc.ABC):
             tools=tools,
         )
 
+    @classmethod
+    def to_harmony_tokens(
+        cls,
+        messages: typing.Union[list["Message"], "Message"],
+        tools: typing.List[FunctionDefinition] | None = None,
+    ) -> typing.List[int]:
+        from str_message.utils.messages_to_harmony import messages_to_harmony_tokens
+
+        return messages_to_harmony_tokens(
+            [messages] if isinstance(messages, Message) else messages,
+            tools=tools,
+        )
+
     @classmethod
     def to_sharegpt(
         cls,
@@ -364,12 +388,28 @@ class MessageUtils(abc.ABC):
 
     @property
     def content_parts(self) -> list[ContentPart]:
-        return self.content_to_parts(self.content)
+        """Parsed parts of `content`, cached until `content` is changed."""
+        # Keyed by the parsed content, so any reassignment of `content`, e.g. by
+        # `add_audio` or `add_image`, invalidates it. Kept out of the model
+        # fields like `functools.cached_property`, so equality is unaffected.
+        cached: typing.Optional[typing.Tuple[str, list[ContentPart]]] = (
+            self.__dict__.get("_content_parts_cache")
+        )
+        if cached is None or (
+            cached[0] is not self.content and cached[0] != self.content
+        ):
+            cached = (self.content, self.content_to_parts(self.content))
+            self.__dict__["_content_parts_cache"] = cached
+        return list(cached[1])
 
     def add_audio(
         self, audio: str | bytes, mime_type: durl.AUDIO_MIME_TYPES
     ) -> typing.Self:
-        data_url = durl.DataURL.from_data(mime_type, audio)
+        from str_message.types.blob_store import get_blob_store
+
+        data_url = str(durl.DataURL.from_data(mime_type, audio))
+        if (blob_store := get_blob_store()) is not None:
+            data_url = blob_store.put(data_url)
         self.content += "\n\n" + str(CONTENT_AUDIO_EXPR.format(input_audio=data_url))
         self.content = self.content.strip()
         return self
@@ -377,7 +417,11 @@ class MessageUtils(abc.ABC):
     def add_image(
         self, image: str | bytes, mime_type: durl.IMAGE_MIME_TYPES
     ) -> typing.Self:
-        data_url = durl.DataURL.from_data(mime_type, image)
+        from str_message.types.blob_store import get_blob_store
+
+        data_url = str(durl.DataURL.from_data(mime_type, image))
+        if (blob_store := get_blob_store()) is not None:
+            data_url = blob_store.put(data_url)
         self.content += "\n\n" + str(CONTENT_IMAGE_URL_EXPR.format(image_url=data_url))
         self.content = self.content.strip()
         return self
@@ -390,6 +434,9 @@ class MessageUtils(abc.ABC):
         max_string: int = 600,
     ) -> str:
         """Format message as readable instructions."""
+        import jinja2
+        from rich.pretty import pretty_repr
+
         from str_message.utils.ensure_tz import ensure_tz
 
         _role = self.role
@@ -569,67 +616,3 @@ ALL_MESSAGE_TYPES = (
     ToolCallOutputMessage,
     UserMessage,
 )
-
-
-class Conversation(pydantic.BaseModel):
-    id: str = pydantic.Field(default_factory=lambda: str(uuid.uuid7()))
-    messages: MessageTypesList = pydantic.Field(default_factory=list)
-    usages: typing.List[openai_usage.Usage] = pydantic.Field(default_factory=list)
-
-    @property
-    def total_cost(self) -> str:
-        import decimal
-
-        total_cost = decimal.Decimal(0)
-        for usage in self.usages:
-            if usage.cost:
-                total_cost += decimal.Decimal(usage.cost)
-        return total_cost.to_eng_string()
-
-    @property
-    def chat_cmpl_messages(self) -> list[ChatCompletionMessageParam]:
-        return Message.to_chat_cmpl_input_messages(self.messages)
-
-    @property
-    def response_input_param(self) -> ResponseInputParam:
-        return Message.to_response_input_param(self.messages)
-
-    def add_message(self, message: MessageTypes | typing.List[MessageTypes]) -> None:
-        if isinstance(message, typing.List):
-            self.messages.extend(message)
-        else:
-            self.messages.append(message)
-
-    def add_usage(
-        self,
-        usage: (
-            openai_usage.Usage
-            | ResponseUsage
-            | agents.RunContextWrapper
-            | agents.Usage
-            | CompletionUsage
-        ),
-        *,
-        model: typing.Optional[str] = None,
-        annotations: typing.Optional[str] = None,
-    ) -> None:
-        if isinstance(usage, openai_usage.Usage):
-            valid_usage = openai_usage.Usage.model_validate_json(
-                usage.model_dump_json()
-            )
-        else:
-            valid_usage = openai_usage.Usage.from_openai(usage)
-
-        if model:
-            valid_usage.model = model
-            valid_usage.cost = valid_usage.estimate_cost_str()
-        else:
-            logger.warning(f"Can not find model '{model}' card")
-
-        if annotations:
-            valid_usage.annotations = annotations
-
-        self.usages.append(valid_usage)
-
-    def clean_messages(self) -> None:
-        self.messages = Message.ensure_reasoning_following_items(self.messages)
@@ -0,0 +1,125 @@
+import abc
+import hashlib
+import logging
+import os
+import pathlib
+import tempfile
+import threading
+import typing
+
+logger = logging.getLogger(__name__)
+
+BLOB_URL_PREFIX = "blob://sha256:"
+
+
+class BlobStore(abc.ABC):
+    """Content-addressed storage for large payloads such as data URLs.
+    Stored payloads are referenced in message content by their blob URL.
+    """
+
+    @abc.abstractmethod
+    def _write(self, digest: str, data: str) -> None: ...
+
+    @abc.abstractmethod
+    def _read(self, digest: str) -> str | None: ...
+
+    @abc.abstractmethod
+    def _has(self, digest: str) -> bool: ...
+
+    def put(self, data: str) -> str:
+        """Store the payload and return its blob URL, equal payloads share one."""
+        digest = hashlib.sha256(data.encode("utf-8")).hexdigest()
+        if not self._has(digest):
+            self._write(digest, data)
+        return BLOB_URL_PREFIX + digest
+
+    def get(self, url: str) -> str:
+        """Return the payload referenced by the blob URL."""
+        data = self._read(self.digest_of(url))
+        if data is None:
+            raise KeyError(f"Blob not found: {url}")
+        return data
+
+    def __contains__(self, url: object) -> bool:
+        try:
+            return isinstance(url, str) and self._has(self.digest_of(url))
+        except ValueError:
+            return False
+
+    @staticmethod
+    def digest_of(url: str) -> str:
+        digest = url[len(BLOB_URL_PREFIX) :] if is_blob_url(url) else ""
+        if len(digest) != 64 or digest.strip("0123456789abcdef"):
+            raise ValueError(f"Invalid blob URL: {url}")
+        return digest
+
+
+class MemoryBlobStore(BlobStore):
+    """Blob store kept in process memory."""
+
+    def __init__(self):
+        self._blobs: typing.Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def _write(self, digest: str, data: str) -> None:
+        self._blobs[digest] = data
+
+    def _read(self, digest: str) -> str | None:
+        return self._blobs.get(digest)
+
+    def _has(self, digest: str) -> bool:
+        return digest in self._blobs
+
+
+class LocalBlobStore(BlobStore):
+    """Blob store persisted as one file per payload in a local directory."""
+
+    def __init__(self, directory: pathlib.Path | str):
+        self.directory = pathlib.Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, digest: str) -> pathlib.Path:
+        return self.directory.joinpath(digest)
+
+    def _write(self, digest: str, data: str) -> None:
+        # Write to a temporary file first, readers never see partial blobs
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=f".{digest}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(digest))
+        except BaseException:
+            pathlib.Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def _read(self, digest: str) -> str | None:
+        try:
+            return self._path(digest).read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+
+    def _has(self, digest: str) -> bool:
+        return self._path(digest).is_file()
+
+
+_blob_store: BlobStore | None = None
+_blob_store_lock = threading.Lock()
+
+
+def is_blob_url(url: str) -> bool:
+    return url.startswith(BLOB_URL_PREFIX)
+
+
+def get_blob_store() -> BlobStore | None:
+    """Return the blob store in use, None when payloads are kept inline."""
+    return _blob_store
+
+
+def set_blob_store(blob_store: BlobStore | None) -> BlobStore | None:
+    """Opt in to out-of-line payloads, returns the previous blob store."""
+    global _blob_store
+    with _blob_store_lock:
+        previous, _blob_store = _blob_store, blob_store
+    return previous
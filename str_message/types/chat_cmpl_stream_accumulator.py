@@ -0,0 +1,188 @@
+import logging
+import typing
+
+import uuid_utils as uuid
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+)
+from openai.types.chat.chat_completion_message import (
+    FunctionCall as ChatCompletionFunctionCall,
+)
+from openai.types.completion_usage import CompletionUsage
+
+from str_message import (
+    AssistantMessage,
+    Message,
+    MessageTypes,
+    ReasoningMessage,
+    ToolCallMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _ToolCallBuffer:
+    def __init__(self, id: str | None):
+        self.id = id
+        self.name: typing.List[str] = []
+        self.arguments: typing.List[str] = []
+
+
+class _ChoiceBuffer:
+    def __init__(self, msg_id: str):
+        self.msg_id = msg_id
+        # Deltas are appended and joined once, not concatenated per chunk
+        self.content: typing.List[str] = []
+        self.reasoning: typing.List[str] = []
+        self.refusal: typing.List[str] = []
+        self.tool_calls: typing.Dict[int, _ToolCallBuffer] = {}
+        self._keys_by_index: typing.Dict[int, int] = {}
+        self._keys_by_id: typing.Dict[str, int] = {}
+        self._last_key: int | None = None
+
+    def add(self, delta: ChoiceDelta) -> None:
+        if delta.content:
+            self.content.append(delta.content)
+        if delta.refusal:
+            self.refusal.append(delta.refusal)
+        # Groq sends `reasoning`, other compatible APIs `reasoning_content`
+        reasoning = getattr(delta, "reasoning", None) or getattr(
+            delta, "reasoning_content", None
+        )
+        if reasoning:
+            self.reasoning.append(reasoning)
+        for tool_call in delta.tool_calls or []:
+            self.add_tool_call(tool_call)
+
+    def add_tool_call(self, delta: ChoiceDeltaToolCall) -> None:
+        # Gemini sends `index=None`, or `0` once patched, for every tool call,
+        # so a new id also starts a new tool call
+        key: int | None = None
+        if delta.id is not None:
+            key = self._keys_by_id.get(delta.id)
+        if key is None and delta.index is not None:
+            key = self._keys_by_index.get(delta.index)
+            if key is not None and delta.id and self.tool_calls[key].id:
+                key = None  # Another tool call at the same index
+        if key is None and delta.id is None and delta.index is None:
+            key = self._last_key
+
+        if key is None:
+            key = len(self.tool_calls)
+            self.tool_calls[key] = _ToolCallBuffer(delta.id)
+        buffer = self.tool_calls[key]
+        if delta.id:
+            buffer.id = delta.id
+            self._keys_by_id[delta.id] = key
+        if delta.index is not None:
+            self._keys_by_index[delta.index] = key
+        if delta.function is not None:
+            if delta.function.name:
+                buffer.name.append(delta.function.name)
+            if delta.function.arguments:
+                buffer.arguments.append(delta.function.arguments)
+        self._last_key = key
+
+    def messages(self, *, final: bool) -> typing.List[MessageTypes]:
+        output: typing.List[MessageTypes] = []
+        if self.reasoning:
+            output.append(
+                ReasoningMessage(
+                    id=self.msg_id,
+                    content="".join(self.reasoning),
+                    channel="analysis",
+                )
+            )
+        if self.content:
+            output.append(
+                AssistantMessage(id=self.msg_id, content="".join(self.content))
+            )
+        elif self.refusal:
+            output.append(
+                AssistantMessage(
+                    id=self.msg_id,
+                    content="".join(self.refusal),
+                    metadata={"is_refusal": "true"},
+                )
+            )
+
+        for buffer in self.tool_calls.values():
+            name = "".join(buffer.name)
+            arguments = "".join(buffer.arguments) or ("{}" if final else "")
+            if not buffer.id or not name or not arguments:
+                if final:
+                    logger.warning(f"Dropping incomplete streamed tool call: {name}")
+                continue
+            if final:
+                Message.set_tool_call(
+                    buffer.id,
+                    ChatCompletionFunctionCall(name=name, arguments=arguments),
+                )
+            output.append(
+                ToolCallMessage(
+                    # Same as the response converters, ids the tool call
+                    id=buffer.id,
+                    role="assistant",
+                    content=f"[tool_call:{name}](#{buffer.id}):{arguments}",
+                    tool_call_id=buffer.id,
+                    tool_name=name,
+                    tool_call_arguments=arguments,
+                )
+            )
+        return output
+
+
+class ChatCmplStreamAccumulator:
+    """Builds messages from `ChatCompletionChunk`s as they stream in.
+    `add` returns the messages of each choice once the choice finishes,
+    `partial_messages` the messages of a choice still streaming.
+    """
+
+    def __init__(self):
+        self._choices: typing.Dict[int, _ChoiceBuffer] = {}
+        self.finished: typing.Dict[int, typing.List[MessageTypes]] = {}
+        self.usage: CompletionUsage | None = None
+
+    def add(self, chunk: ChatCompletionChunk) -> typing.List[MessageTypes]:
+        """Consume one chunk, returns the messages of the choices it finishes."""
+        if chunk.usage is not None:
+            self.usage = chunk.usage
+
+        output: typing.List[MessageTypes] = []
+        for choice in chunk.choices:
+            if choice.index in self.finished:
+                logger.warning(f"Choice {choice.index} already finished, skipping")
+                continue
+            buffer = self._choices.get(choice.index)
+            if buffer is None:
+                # Same id as `message_from_chat_cmpl` gives the first choice
+                msg_id = chunk.id if choice.index == 0 else str(uuid.uuid7())
+                buffer = self._choices[choice.index] = _ChoiceBuffer(msg_id)
+            buffer.add(choice.delta)
+            if choice.finish_reason is not None:
+                output.extend(self._finish(choice.index))
+        return output
+
+    def finish(self) -> typing.List[MessageTypes]:
+        """Finish the choices the stream ended without a finish reason for."""
+        output: typing.List[MessageTypes] = []
+        for index in sorted(self._choices):
+            output.extend(self._finish(index))
+        return output
+
+    def partial_messages(self, index: int = 0) -> typing.List[MessageTypes]:
+        """Messages of the choice so far, tool calls once their name and id
+        and some arguments arrived. Finished choices return their messages.
+        """
+        if index in self.finished:
+            return list(self.finished[index])
+        if (buffer := self._choices.get(index)) is None:
+            return []
+        return buffer.messages(final=False)
+
+    def _finish(self, index: int) -> typing.List[MessageTypes]:
+        buffer = self._choices.pop(index)
+        messages = self.finished[index] = buffer.messages(final=True)
+        return messages
@@ -1,3 +1,6 @@
+import copy
+import functools
+import json
 import logging
 import typing
 
@@ -11,10 +14,27 @@ from openai.types.shared_params.function_definition import (
     FunctionDefinition as FunctionDefinitionParam,
 )
 
+from str_message.types.messages_params_cache import params_copy
+
 logger = logging.getLogger(__name__)
 
 
 class FuncDef:
+    """A function tool and its callable. The strict schema and the tool
+    params are built once, each access returns a copy so callers can not
+    change the cached ones or their JSON. Assigning an attribute rebuilds
+    them on next access.
+    """
+
+    _cached_attrs: typing.ClassVar[typing.Tuple[str, ...]] = (
+        "_parameters",
+        "_chat_cmpl_tool_param",
+        "chat_cmpl_tool_param_json",
+        "_response_tool_param",
+        "response_tool_param_json",
+        "agents_tool",
+    )
+
     def __init__(
         self,
         func_def: FunctionDefinition,
@@ -30,6 +50,12 @@ class FuncDef:
         self.context = context
         self.strict = strict
 
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        super().__setattr__(name, value)
+        if name not in self._cached_attrs:
+            for attr in self._cached_attrs:
+                self.__dict__.pop(attr, None)
+
     @property
     def name(self) -> str:
         return self.func_def.name
@@ -40,7 +66,12 @@ class FuncDef:
 
     @property
     def parameters(self) -> typing.Dict[str, typing.Any]:
-        param = self.func_def.parameters or {}
+        """Strict JSON schema of the arguments, `func_def.parameters` is not changed."""
+        return params_copy(self._parameters)
+
+    @functools.cached_property
+    def _parameters(self) -> typing.Dict[str, typing.Any]:
+        param = copy.deepcopy(self.func_def.parameters or {})
         param["additionalProperties"] = False
         if properties := param.get("properties"):
             param["required"] = list(dict(properties).keys())  # type: ignore
@@ -52,28 +83,48 @@ class FuncDef:
 
     @property
     def chat_cmpl_tool_param(self) -> ChatCompletionToolParam:
+        return params_copy(self._chat_cmpl_tool_param)
+
+    @functools.cached_property
+    def _chat_cmpl_tool_param(self) -> ChatCompletionToolParam:
         return ChatCompletionToolParam(
             function=FunctionDefinitionParam(
                 name=self.name,
                 description=self.description,
-                parameters=self.parameters,
+                parameters=self._parameters,
                 strict=self.strict,
             ),
             type="function",
         )
 
+    @functools.cached_property
+    def chat_cmpl_tool_param_json(self) -> bytes:
+        """`chat_cmpl_tool_param` serialized as compact JSON."""
+        return _json_bytes(self._chat_cmpl_tool_param)
+
     @property
     def response_tool_param(self) -> ToolParam:
+        return params_copy(self._response_tool_param)
+
+    @functools.cached_property
+    def _response_tool_param(self) -> ToolParam:
         return FunctionToolParam(
             name=self.name,
-            parameters=self.parameters,
+            parameters=self._parameters,
             strict=self.strict,
             type="function",
             description=self.description,
         )
 
-    @property
+    @functools.cached_property
+    def response_tool_param_json(self) -> bytes:
+        """`response_tool_param` serialized as compact JSON."""
+        return _json_bytes(self._response_tool_param)
+
+    @functools.cached_property
     def agents_tool(self) -> agents.FunctionTool:
+        """Built once, with its own copy of the schema."""
+
         async def on_invoke_tool(
             ctx: agents.RunContextWrapper[agents.TContext], arguments: str
         ) -> typing.Any:
@@ -90,7 +141,11 @@ class FuncDef:
         return agents.FunctionTool(
             name=self.name,
             description=self.description,
-            params_json_schema=self.parameters,
+            params_json_schema=self.parameters,  # A copy, not the cached one
             on_invoke_tool=on_invoke_tool,
             strict_json_schema=self.strict,
         )
+
+
+def _json_bytes(data: typing.Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,74 @@
+import logging
+import typing
+
+from str_message import (
+    McpCallMessage,
+    MessageTypes,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MessageIndexes:
+    """Lookups of a conversation's messages by message id and call id.
+    Kept in sync with the messages list, appended messages are indexed on
+    their own, a new, shorter or reordered list rebuilds the indexes. Only
+    the length and the last message are checked, messages replaced in place
+    elsewhere, or call ids edited in place, need `reindex`.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self.by_id: typing.Dict[str, MessageTypes] = {}
+        self.tool_calls: typing.Dict[str, ToolCallMessage] = {}
+        self.tool_call_outputs: typing.Dict[str, ToolCallOutputMessage] = {}
+        self.mcp_calls: typing.Dict[str, McpCallMessage] = {}
+        self.pending_tool_calls: typing.Dict[str, ToolCallMessage] = {}
+        self._messages: typing.List[MessageTypes] | None = None
+        self._count: int = 0
+        self._last: MessageTypes | None = None
+
+    def add(self, messages: typing.Iterable[MessageTypes]) -> None:
+        for message in messages:
+            self._count += 1
+            self._last = message
+            self.by_id[message.id] = message
+
+            if isinstance(message, ToolCallMessage):
+                self.tool_calls[message.tool_call_id] = message
+                if message.tool_call_id not in self.tool_call_outputs:
+                    self.pending_tool_calls[message.tool_call_id] = message
+            elif isinstance(message, ToolCallOutputMessage):
+                self.tool_call_outputs[message.tool_call_id] = message
+                self.pending_tool_calls.pop(message.tool_call_id, None)
+            elif isinstance(message, McpCallMessage):
+                self.mcp_calls[message.mcp_call_id] = message
+
+    def extend_from(self, messages: typing.List[MessageTypes], start: int) -> None:
+        """Index `messages[start:]` when the messages before are the indexed ones,
+        otherwise the indexes are rebuilt on the next `sync`.
+        """
+        if self._messages is messages and self._count == start:
+            self.add(messages[start:])
+
+    def sync(self, messages: typing.List[MessageTypes]) -> None:
+        count = self._count
+        if self._messages is messages and count <= len(messages):
+            if count == 0 or messages[count - 1] is self._last:
+                if count < len(messages):
+                    self.add(messages[count:])
+                return
+
+        if self._messages is not None:
+            logger.debug("Messages changed in place, rebuilding message indexes")
+        self.reindex(messages)
+
+    def reindex(self, messages: typing.List[MessageTypes]) -> None:
+        """Rebuild the indexes from all the messages."""
+        self.clear()
+        self._messages = messages
+        self.add(messages)
@@ -0,0 +1,107 @@
+import copy
+import logging
+import typing
+
+if typing.TYPE_CHECKING:
+    from str_message import Message
+
+logger = logging.getLogger(__name__)
+
+T = typing.TypeVar("T")
+
+
+class _CachedParams(typing.NamedTuple):
+    message_type: typing.Type["Message"]
+    values: typing.Dict[str, typing.Any]
+    params: typing.List[typing.Any]
+
+
+class MessagesParamsCache(typing.Generic[T]):
+    """Cache of the params each message converts to, keyed by message id.
+    Only new or changed messages are converted again, so appending to a
+    conversation converts just the appended tail. The params returned are
+    copies, mutating them does not change later results.
+    """
+
+    def __init__(self, convert: typing.Callable[["Message"], typing.Iterable[T]]):
+        self.convert = convert
+        self._cached: typing.Dict[str, _CachedParams] = {}
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._cached)
+
+    def get(self, messages: typing.Iterable["Message"]) -> typing.List[T]:
+        cached: typing.Dict[str, _CachedParams] = {}
+        output: typing.List[T] = []
+
+        for message in messages:
+            entry = cached.get(message.id) or self._cached.get(message.id)
+            if (
+                entry is None
+                or entry.message_type is not type(message)
+                or (
+                    entry.values != message.__dict__
+                    and not message_unchanged(entry.values, message)
+                )
+            ):
+                params = list(self.convert(message))
+                entry = _CachedParams(type(message), message_snapshot(message), params)
+                self.misses += 1
+            else:
+                self.hits += 1
+            cached[message.id] = entry
+            # Callers get their own copies, the cached params stay intact
+            output.extend(map(params_copy, entry.params))
+
+        # Messages removed from the conversation are dropped from the cache
+        self._cached = cached
+        return output
+
+    def clear(self) -> None:
+        self._cached.clear()
+
+
+def params_copy(value: T) -> T:
+    """Copy the dicts and lists of the params, strings and numbers are shared.
+    Much cheaper than `copy.deepcopy` for JSON-like params.
+    """
+    if isinstance(value, dict):
+        value = value.copy()  # type: ignore
+        for key, item in value.items():  # type: ignore
+            if isinstance(item, (dict, list)):
+                value[key] = params_copy(item)  # type: ignore
+        return value
+    if isinstance(value, list):
+        return [  # type: ignore
+            params_copy(item) if isinstance(item, (dict, list)) else item
+            for item in value
+        ]
+    return value
+
+
+def message_snapshot(message: "Message") -> typing.Dict[str, typing.Any]:
+    """Copy of the message values, to tell later if the message was edited.
+    Mutable values such as `metadata` are copied, so in-place edits are seen.
+    """
+    return {
+        key: copy.deepcopy(value) if isinstance(value, (dict, list)) else value
+        for key, value in message.__dict__.items()
+    }
+
+
+def message_unchanged(
+    snapshot: typing.Dict[str, typing.Any], message: "Message"
+) -> bool:
+    values = message.__dict__
+    if snapshot == values:
+        return True
+    # Values cached in `__dict__`, e.g. the parsed content parts, are not fields
+    return all(
+        values.get(key, _MISSING) == snapshot.get(key, _MISSING)
+        for key in type(message).model_fields
+    )
+
+
+_MISSING = object()
@@ -0,0 +1,139 @@
+import logging
+import typing
+
+from openai.types.responses.response_function_tool_call import ResponseFunctionToolCall
+from openai.types.responses.response_output_item import ResponseOutputItem
+from openai.types.responses.response_output_message import ResponseOutputMessage
+from openai.types.responses.response_reasoning_item import ResponseReasoningItem
+from openai.types.responses.response_stream_event import ResponseStreamEvent
+from openai.types.responses.response_usage import ResponseUsage
+
+from str_message import (
+    AssistantMessage,
+    MessageTypes,
+    ToolCallMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _ItemBuffer:
+    def __init__(self, item: ResponseOutputItem):
+        self.item = item
+        # Deltas are appended and joined once, not concatenated per event
+        self.parts: typing.Dict[int, typing.List[str]] = {}
+        self.summary_parts: typing.Dict[int, typing.List[str]] = {}
+
+    def append(self, index: int, delta: str, *, summary: bool = False) -> None:
+        parts = self.summary_parts if summary else self.parts
+        parts.setdefault(index, []).append(delta)
+
+    def texts(self, *, summary: bool = False) -> typing.List[str]:
+        parts = self.summary_parts if summary else self.parts
+        return ["".join(parts[idx]) for idx in sorted(parts)]
+
+
+class ResponseStreamBuilder:
+    """Builds messages from Responses API stream events as they arrive.
+    `add` returns the messages of each output item once the item is done,
+    so tool calls can run while the model still streams later items.
+    """
+
+    def __init__(self):
+        self._items: typing.Dict[int, _ItemBuffer] = {}
+        self.usage: ResponseUsage | None = None
+
+    def add(self, event: ResponseStreamEvent) -> typing.List[MessageTypes]:
+        """Consume one event, returns the messages of the item it completes."""
+        from str_message.utils.message_from_response_output_item import (
+            message_from_response_output_item,
+        )
+
+        if event.type == "response.output_item.added":
+            self._items[event.output_index] = _ItemBuffer(event.item)
+
+        elif event.type in (
+            "response.output_text.delta",
+            "response.refusal.delta",
+            "response.reasoning_text.delta",
+        ):
+            if (buffer := self._items.get(event.output_index)) is not None:
+                buffer.append(event.content_index, event.delta)
+
+        elif event.type in (
+            "response.function_call_arguments.delta",
+            "response.mcp_call_arguments.delta",
+        ):
+            if (buffer := self._items.get(event.output_index)) is not None:
+                buffer.append(0, event.delta)
+
+        elif event.type == "response.reasoning_summary_text.delta":
+            if (buffer := self._items.get(event.output_index)) is not None:
+                buffer.append(event.summary_index, event.delta, summary=True)
+
+        elif event.type == "response.output_item.done":
+            # The done item is complete, the buffered deltas are dropped
+            self._items.pop(event.output_index, None)
+            return message_from_response_output_item(event.item)
+
+        elif event.type in ("response.completed", "response.incomplete"):
+            self.usage = event.response.usage
+
+        return []
+
+    async def messages_gen(
+        self, events: typing.AsyncIterable[ResponseStreamEvent]
+    ) -> typing.AsyncGenerator[MessageTypes, None]:
+        """Yield messages as each output item of the stream is done."""
+        async for event in events:
+            for message in self.add(event):
+                yield message
+
+    def partial_messages(self, output_index: int) -> typing.List[MessageTypes]:
+        """Messages of an output item still streaming, built from its deltas.
+        Only message, function call and reasoning items are supported.
+        """
+        from str_message.utils.message_from_response_output_item import (
+            message_from_response_output_item,
+        )
+
+        if (buffer := self._items.get(output_index)) is None:
+            return []
+        item = buffer.item
+
+        if isinstance(item, ResponseOutputMessage):
+            return [AssistantMessage(id=item.id, content="\n\n".join(buffer.texts()))]
+
+        elif isinstance(item, ResponseFunctionToolCall):
+            arguments = "".join(buffer.texts())
+            if not arguments:
+                return []
+            # Not registered as a tool call until the item is done
+            return [
+                ToolCallMessage(
+                    id=item.call_id,
+                    tool_call_id=item.call_id,
+                    tool_name=item.name,
+                    tool_call_arguments=arguments,
+                )
+            ]
+
+        elif isinstance(item, ResponseReasoningItem):
+            # Same content as the done item converts to
+            partial = ResponseReasoningItem.model_validate(
+                {
+                    **item.model_dump(exclude={"summary", "content"}),
+                    "summary": [
+                        {"type": "summary_text", "text": text}
+                        for text in buffer.texts(summary=True)
+                    ],
+                    "content": [
+                        {"type": "reasoning_text", "text": text}
+                        for text in buffer.texts()
+                    ]
+                    or None,
+                }
+            )
+            return message_from_response_output_item(partial)
+
+        return []
@@ -0,0 +1,498 @@
+import abc
+import contextlib
+import contextvars
+import logging
+import math
+import multiprocessing.util
+import os
+import pathlib
+import sqlite3
+import threading
+import time
+import typing
+import weakref
+
+import cachetools
+from openai.types.chat.chat_completion_message import (
+    FunctionCall as ChatCompletionFunctionCall,
+)
+from openai.types.responses.response_function_tool_call import ResponseFunctionToolCall
+
+logger = logging.getLogger(__name__)
+
+ToolCall: typing.TypeAlias = ChatCompletionFunctionCall | ResponseFunctionToolCall
+
+DEFAULT_MAXSIZE = 1000
+DEFAULT_TTL = 60 * 60  # 1 hour
+DEFAULT_SHARDS = 16
+
+
+class ToolCallRegistryStats(typing.NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class ToolCallRegistry(abc.ABC):
+    """Tool calls by call id, so outputs converted later can find their tool.
+    Entries are evicted when the registry is full or after `ttl` seconds.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    def __init__(self, *, maxsize: int = DEFAULT_MAXSIZE, ttl: float = DEFAULT_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._stats_lock = threading.Lock()
+
+    @abc.abstractmethod
+    def _get(self, call_id: str) -> ToolCall | None: ...
+
+    @abc.abstractmethod
+    def _set(self, call_id: str, tool_call: ToolCall) -> None: ...
+
+    @abc.abstractmethod
+    def __len__(self) -> int: ...
+
+    @abc.abstractmethod
+    def clear(self) -> None: ...
+
+    def get(self, call_id: str) -> ToolCall | None:
+        tool_call = self._get(call_id)
+        with self._stats_lock:
+            if tool_call is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return tool_call
+
+    def set(self, call_id: str, tool_call: ToolCall) -> None:
+        self._set(call_id, tool_call)
+
+    @property
+    def stats(self) -> ToolCallRegistryStats:
+        size = len(self)  # Expired entries are evicted first
+        return ToolCallRegistryStats(self.hits, self.misses, self.evictions, size)
+
+
+class TTLToolCallRegistry(ToolCallRegistry):
+    """In-memory registry for use from one thread or one event loop."""
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL,
+        timer: typing.Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._cache = _EvictionCountingTTLCache(
+            self, maxsize=maxsize, ttl=ttl, timer=timer
+        )
+
+    def _get(self, call_id: str) -> ToolCall | None:
+        return self._cache.get(call_id)
+
+    def _set(self, call_id: str, tool_call: ToolCall) -> None:
+        self._cache[call_id] = tool_call
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class ShardedToolCallRegistry(ToolCallRegistry):
+    """Registry safe to share between threads and asyncio tasks.
+    Call ids are spread over `shards` independently locked TTL caches, so
+    concurrent callers rarely wait on the same lock. Each shard holds
+    `maxsize / shards` entries plus headroom for uneven hashing, so calls
+    are practically never evicted before `maxsize` calls are stored. Locks
+    are never held across an `await`.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL,
+        shards: int = DEFAULT_SHARDS,
+        timer: typing.Callable[[], float] = time.monotonic,
+    ):
+        if shards < 1:
+            raise ValueError(f"shards must be at least 1, got {shards}")
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        shard_maxsize = _shard_maxsize(maxsize, shards)
+        self._shards: typing.Tuple[_Shard, ...] = tuple(
+            _Shard(
+                threading.Lock(),
+                TTLToolCallRegistry(maxsize=shard_maxsize, ttl=ttl, timer=timer),
+            )
+            for _ in range(shards)
+        )
+
+    def _shard(self, call_id: str) -> "_Shard":
+        return self._shards[hash(call_id) % len(self._shards)]
+
+    def _get(self, call_id: str) -> ToolCall | None:
+        shard = self._shard(call_id)
+        with shard.lock:
+            return shard.registry._get(call_id)
+
+    def _set(self, call_id: str, tool_call: ToolCall) -> None:
+        shard = self._shard(call_id)
+        with shard.lock:
+            shard.registry._set(call_id, tool_call)
+
+    def get(self, call_id: str) -> ToolCall | None:
+        # Counted per shard, under the shard lock
+        shard = self._shard(call_id)
+        with shard.lock:
+            return shard.registry.get(call_id)
+
+    def __len__(self) -> int:
+        size = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.registry)
+        return size
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.registry.clear()
+
+    @property
+    def hits(self) -> int:
+        return sum(shard.registry.hits for shard in self._shards)
+
+    @property
+    def misses(self) -> int:
+        return sum(shard.registry.misses for shard in self._shards)
+
+    @property
+    def evictions(self) -> int:
+        return sum(shard.registry.evictions for shard in self._shards)
+
+
+def _shard_maxsize(maxsize: int, shards: int) -> int:
+    if shards == 1:
+        return maxsize
+    # Entries per shard are about binomial, 4 standard deviations of headroom
+    per_shard = maxsize / shards
+    return max(1, math.ceil(per_shard + 4 * math.sqrt(per_shard)) + 1)
+
+
+class _Shard(typing.NamedTuple):
+    lock: threading.Lock
+    registry: TTLToolCallRegistry
+
+
+class SQLiteToolCallRegistry(ToolCallRegistry):
+    """Registry shared by the processes of one host through a SQLite file in
+    WAL mode, e.g. the workers of a `ProcessPoolExecutor`.
+
+    Writes are buffered and committed in one transaction once `batch_size`
+    calls are pending, or by a timer `flush_interval` seconds after the
+    first. Call `flush` when other processes must see the calls right away.
+    Entries expire `ttl` seconds after they were set, and the oldest are
+    evicted when more than `maxsize` are stored.
+
+    Unpickling returns the registry already open on the same path in the
+    process, so every task a worker runs shares one write buffer.
+    """
+
+    _instances: typing.ClassVar[weakref.WeakValueDictionary] = (
+        weakref.WeakValueDictionary()
+    )
+    _instances_lock: typing.ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self,
+        path: pathlib.Path | str,
+        *,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttl: float = DEFAULT_TTL,
+        batch_size: int = 32,
+        flush_interval: float = 0.05,
+        timer: typing.Callable[[], float] = time.time,
+    ):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.path = pathlib.Path(path).resolve()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.timer = timer
+        self._open()
+
+    def _open(self) -> None:
+        self._pid = os.getpid()
+        self._writer = _SQLiteWriter(
+            self.path,
+            maxsize=self.maxsize,
+            flush_interval=self.flush_interval,
+            timer=self.timer,
+        )
+        # Weak, like `weakref.finalize`, and also run as a pool worker exits
+        self._finalizer = multiprocessing.util.Finalize(
+            self, self._writer.close, exitpriority=10
+        )
+        with self._instances_lock:
+            self._instances.setdefault((self.path, self._pid), self)
+
+    def _check_pid(self) -> None:
+        # The connection of a forked parent must not be used by the child
+        if self._pid != os.getpid():
+            self._open()
+
+    def __reduce__(self):
+        return (
+            _sqlite_tool_call_registry,
+            (
+                self.path,
+                {
+                    "maxsize": self.maxsize,
+                    "ttl": self.ttl,
+                    "batch_size": self.batch_size,
+                    "flush_interval": self.flush_interval,
+                    "timer": self.timer,
+                },
+            ),
+        )
+
+    def _get(self, call_id: str) -> ToolCall | None:
+        return self._writer.get(call_id)
+
+    def _set(self, call_id: str, tool_call: ToolCall) -> None:
+        kind = (
+            "chat_cmpl"
+            if isinstance(tool_call, ChatCompletionFunctionCall)
+            else "response"
+        )
+        self._writer.set(call_id, kind, tool_call.model_dump_json(), self.ttl)
+        if len(self._writer.pending) >= self.batch_size:
+            self._writer.flush()
+
+    def get(self, call_id: str) -> ToolCall | None:
+        self._check_pid()
+        return super().get(call_id)
+
+    def set(self, call_id: str, tool_call: ToolCall) -> None:
+        self._check_pid()
+        self._set(call_id, tool_call)
+
+    def flush(self) -> None:
+        """Commit the pending tool calls, so other processes can see them."""
+        self._check_pid()
+        self._writer.flush()
+
+    @property
+    def evictions(self) -> int:
+        return self._writer.evictions
+
+    def __len__(self) -> int:
+        self.flush()
+        return self._writer.count()
+
+    def clear(self) -> None:
+        self._check_pid()
+        self._writer.clear()
+
+    def close(self) -> None:
+        """Flush the pending tool calls and close the connection."""
+        self._finalizer()
+
+
+def _sqlite_tool_call_registry(
+    path: pathlib.Path, kwargs: typing.Dict[str, typing.Any]
+) -> SQLiteToolCallRegistry:
+    with SQLiteToolCallRegistry._instances_lock:
+        registry = SQLiteToolCallRegistry._instances.get((path, os.getpid()))
+    if registry is None:
+        registry = SQLiteToolCallRegistry(path, **kwargs)
+    return registry
+
+
+class _SQLiteWriter:
+    """Connection and write buffer of a `SQLiteToolCallRegistry`, kept apart
+    so the flush timer and finalizer do not keep the registry alive.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        *,
+        maxsize: int,
+        flush_interval: float,
+        timer: typing.Callable[[], float],
+    ):
+        self.maxsize = maxsize
+        self.flush_interval = flush_interval
+        self.timer = timer
+        self.evictions: int = 0
+        self.pending: typing.Dict[str, typing.Tuple[str, str, float]] = {}
+        self._flush_timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_calls ("
+            + "call_id TEXT PRIMARY KEY, kind TEXT NOT NULL, "
+            + "data TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS tool_calls_expires_at "
+            + "ON tool_calls (expires_at)"
+        )
+
+    def get(self, call_id: str) -> ToolCall | None:
+        with self._lock:
+            if (pending := self.pending.get(call_id)) is not None:
+                kind, data, expires_at = pending
+            else:
+                assert self._conn is not None, "Registry is closed"
+                row = self._conn.execute(
+                    "SELECT kind, data, expires_at FROM tool_calls "
+                    + "WHERE call_id = ?",
+                    (call_id,),
+                ).fetchone()
+                if row is None:
+                    return None
+                kind, data, expires_at = row
+        if expires_at <= self.timer():
+            return None
+        return _TOOL_CALL_KINDS[kind].model_validate_json(data)
+
+    def set(self, call_id: str, kind: str, data: str, ttl: float) -> None:
+        with self._lock:
+            self.pending[call_id] = (kind, data, self.timer() + ttl)
+            if self._flush_timer is None:
+                # Commits the batch while the process keeps running
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if not self.pending or self._conn is None:
+            return
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO tool_calls VALUES (?, ?, ?, ?)",
+                [(call_id, *values) for call_id, values in self.pending.items()],
+            )
+            self.evictions += self._evict()
+        self.pending.clear()
+
+    def _evict(self) -> int:
+        assert self._conn is not None
+        evicted = self._conn.execute(
+            "DELETE FROM tool_calls WHERE expires_at <= ?", (self.timer(),)
+        ).rowcount
+        evicted += self._conn.execute(
+            "DELETE FROM tool_calls WHERE call_id IN ("
+            + "SELECT call_id FROM tool_calls ORDER BY expires_at "
+            + "LIMIT max((SELECT count(*) FROM tool_calls) - ?, 0))",
+            (self.maxsize,),
+        ).rowcount
+        return evicted
+
+    def count(self) -> int:
+        with self._lock:
+            assert self._conn is not None, "Registry is closed"
+            return self._conn.execute(
+                "SELECT count(*) FROM tool_calls WHERE expires_at > ?",
+                (self.timer(),),
+            ).fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self.pending.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM tool_calls")
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_TOOL_CALL_KINDS: typing.Dict[str, typing.Type[ToolCall]] = {
+    "chat_cmpl": ChatCompletionFunctionCall,
+    "response": ResponseFunctionToolCall,
+}
+
+
+class _EvictionCountingTTLCache(cachetools.TTLCache):
+    def __init__(
+        self,
+        registry: ToolCallRegistry,
+        *,
+        maxsize: int,
+        ttl: float,
+        timer: typing.Callable[[], float],
+    ):
+        super().__init__(maxsize=maxsize, ttl=ttl, timer=timer)
+        self._registry = registry
+
+    def popitem(self):
+        # Called when the cache is full
+        item = super().popitem()
+        self._registry.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self._registry.evictions += len(expired)
+        return expired
+
+
+# Sharded, so threads converting messages rarely wait on one lock. Shards
+# have headroom, so it holds at least `DEFAULT_MAXSIZE` calls like the
+# class-level cache it replaces
+_default_tool_call_registry: ToolCallRegistry = ShardedToolCallRegistry()
+_tool_call_registry: contextvars.ContextVar[ToolCallRegistry | None] = (
+    contextvars.ContextVar("tool_call_registry", default=None)
+)
+
+
+def get_tool_call_registry() -> ToolCallRegistry:
+    """Return the registry of the current context, else the process default."""
+    registry = _tool_call_registry.get()
+    return _default_tool_call_registry if registry is None else registry
+
+
+def set_default_tool_call_registry(registry: ToolCallRegistry) -> ToolCallRegistry:
+    """Replace the process default registry, returns the previous one."""
+    global _default_tool_call_registry
+    previous, _default_tool_call_registry = _default_tool_call_registry, registry
+    return previous
+
+
+@contextlib.contextmanager
+def use_tool_call_registry(
+    registry: ToolCallRegistry,
+) -> typing.Generator[ToolCallRegistry, None, None]:
+    """Scope the registry to the current context, e.g. a thread or an asyncio
+    task, so concurrent sessions do not evict each other's tool calls.
+    """
+    token = _tool_call_registry.set(registry)
+    try:
+        yield registry
+    finally:
+        _tool_call_registry.reset(token)
@@ -0,0 +1,151 @@
+import asyncio
+import concurrent.futures
+import contextlib
+import functools
+import inspect
+import logging
+import typing
+
+from str_message import ToolCallMessage, ToolCallOutputMessage
+
+if typing.TYPE_CHECKING:
+    from str_message import Conversation
+    from str_message.types.func_def import FuncDef
+
+logger = logging.getLogger(__name__)
+
+
+class ToolExecutor:
+    """Runs the tool calls of a turn concurrently and returns their outputs
+    in the order of the calls.
+
+    `concurrency` limits the calls of each tool running at once, by tool
+    name, `default_concurrency` the tools not listed. `timeout` and
+    `timeouts` bound each call in seconds. Sync callables run in `executor`,
+    the default thread pool of the loop when None. A failed or timed out
+    call returns its error as the output, cancelling `run` cancels the
+    calls still running. A sync callable can not be stopped, it keeps
+    running in its thread after its call timed out.
+    """
+
+    def __init__(
+        self,
+        func_defs: typing.Iterable["FuncDef"],
+        *,
+        concurrency: typing.Mapping[str, int] | None = None,
+        default_concurrency: int | None = None,
+        timeout: float | None = None,
+        timeouts: typing.Mapping[str, float] | None = None,
+        executor: concurrent.futures.Executor | None = None,
+    ):
+        self.func_defs: typing.Dict[str, "FuncDef"] = {f.name: f for f in func_defs}
+        self.concurrency = dict(concurrency or {})
+        self.default_concurrency = default_concurrency
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.executor = executor
+        self._semaphores: typing.Dict[str, asyncio.Semaphore | None] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def run(
+        self, tool_calls: typing.Iterable[ToolCallMessage]
+    ) -> typing.List[ToolCallOutputMessage]:
+        return list(await asyncio.gather(*(self.call(tc) for tc in tool_calls)))
+
+    async def run_conversation(
+        self, conversation: "Conversation"
+    ) -> typing.List[ToolCallOutputMessage]:
+        """Run the pending tool calls of the conversation and add their outputs."""
+        outputs = await self.run(conversation.pending_tool_calls())
+        conversation.add_message(outputs)
+        return outputs
+
+    async def call(self, tool_call: ToolCallMessage) -> ToolCallOutputMessage:
+        name = tool_call.tool_name
+        func_def = self.func_defs.get(name)
+        if func_def is None:
+            logger.warning(
+                f"Tool '{name}' not found for call '{tool_call.tool_call_id}'"
+            )
+            return self._output(tool_call, f"Error: Tool '{name}' not found")
+
+        timeout = self.timeouts.get(name, self.timeout)
+        try:
+            async with self._semaphore(name) or contextlib.nullcontext():
+                result = await asyncio.wait_for(
+                    self._invoke(func_def, tool_call), timeout
+                )
+        except _ToolError as e:
+            # Also a `TimeoutError` raised by the tool itself
+            error = e.__cause__
+            logger.error(f"Tool '{name}' failed", exc_info=error)
+            return self._output(tool_call, f"Error: {type(error).__name__}: {error}")
+        except asyncio.TimeoutError:
+            logger.warning(f"Tool '{name}' timed out after {timeout}s")
+            return self._output(
+                tool_call, f"Error: Tool '{name}' timed out after {timeout}s"
+            )
+        return self._output(
+            tool_call, result if isinstance(result, str) else str(result)
+        )
+
+    async def _invoke(
+        self, func_def: "FuncDef", tool_call: ToolCallMessage
+    ) -> typing.Any:
+        # Errors of the tool are wrapped, so they are not taken for the timeout
+        try:
+            return await self._invoke_tool(func_def, tool_call)
+        except Exception as e:
+            raise _ToolError() from e
+
+    async def _invoke_tool(
+        self, func_def: "FuncDef", tool_call: ToolCallMessage
+    ) -> typing.Any:
+        # Same arguments as `FuncDef.agents_tool` passes
+        args: typing.Tuple[typing.Any, ...] = (
+            (func_def.context, tool_call.tool_call_arguments)
+            if func_def.is_context_required
+            else (tool_call.tool_call_arguments,)
+        )
+        if _is_async_callable(func_def.callable):
+            return await func_def.callable(*args)
+
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self.executor, functools.partial(func_def.callable, *args)
+        )
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+    def _semaphore(self, name: str) -> asyncio.Semaphore | None:
+        # Semaphores are bound to the loop they are first used in
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._semaphores.clear()
+            self._loop = loop
+        if name not in self._semaphores:
+            limit = self.concurrency.get(name, self.default_concurrency)
+            self._semaphores[name] = None if limit is None else asyncio.Semaphore(limit)
+        return self._semaphores[name]
+
+    @staticmethod
+    def _output(tool_call: ToolCallMessage, content: str) -> ToolCallOutputMessage:
+        return ToolCallOutputMessage(
+            content=content,
+            tool_call_id=tool_call.tool_call_id,
+            tool_name=tool_call.tool_name,
+            tool_call_arguments=tool_call.tool_call_arguments,
+        )
+
+
+class _ToolError(Exception):
+    """An error raised by a tool, the error is the cause."""
+
+
+def _is_async_callable(func: typing.Callable[..., typing.Any]) -> bool:
+    while isinstance(func, functools.partial):
+        func = func.func
+    return inspect.iscoroutinefunction(func) or inspect.iscoroutinefunction(
+        getattr(func, "__call__", None)
+    )
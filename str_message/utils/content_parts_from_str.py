@@ -1,42 +1,93 @@
-import re
+import logging
+import typing
 
-from str_message import ContentPart
+from str_message import ALL_CONTENT_TYPES, CONTENT_TEXT_TYPE, ContentPart
+
+logger = logging.getLogger(__name__)
+
+
+class ContentPartSpan(typing.NamedTuple):
+    """A content part as offsets into the content, `content[start:end]` is the value."""
+
+    type: str
+    start: int
+    end: int
 
 
 def content_parts_from_str(content: str) -> list[ContentPart]:
     """Parse content string into ContentPart objects.
     Extracts text and special @![type](value) syntax into structured parts.
     """
-    content = content.strip()
+    return [
+        _content_part(span.type, content[span.start : span.end])
+        for span in content_part_spans_from_str(content)
+    ]
 
-    # Pattern to match @![type](value) syntax
-    pattern: str = r"@!\[([^\]]+)\]\(([^\)]+)\)"
 
-    parts: list[ContentPart] = []
+def content_part_spans_from_str(content: str) -> list[ContentPartSpan]:
+    """Tokenize content in a single pass without copying any part values.
+    Text spans are stripped of surrounding whitespace, empty ones are dropped.
+    """
+    # Same matches as the pattern r"@!\[([^\]]+)\]\(([^\)]+)\)", but scanned
+    # with `str.find`, which skips over large data URLs much faster than `re`
+    spans: list[ContentPartSpan] = []
     last_end: int = 0
+    find = content.find
+
+    start = find("@![")
+    while start != -1:
+        type_end = find("]", start + 3)
+        if type_end == -1:
+            break  # No more closing brackets, no more matches
 
-    # Find all special syntax matches
-    for match in re.finditer(pattern, content):
-        start: int = match.start()
-        end: int = match.end()
+        if type_end > start + 3 and content.startswith("(", type_end + 1):
+            value_end = find(")", type_end + 2)
+            if value_end == -1:
+                break  # No more closing parentheses, no more matches
 
-        # Add text before this match (if any)
-        if start > last_end:
-            text_value: str = content[last_end:start].strip()
-            if text_value:
-                parts.append(ContentPart(type="text", value=text_value))
+            if value_end > type_end + 2:
+                # Add text before this match (if any)
+                if span := _text_span(content, last_end, start):
+                    spans.append(span)
 
-        # Add the matched special syntax
-        type_value: str = match.group(1)  # Content inside [...]
-        value_content: str = match.group(2)  # Content inside (...)
-        parts.append(ContentPart(type=type_value, value=value_content))
+                # Add the matched special syntax, value is the content inside (...)
+                spans.append(
+                    ContentPartSpan(
+                        content[start + 3 : type_end], type_end + 2, value_end
+                    )
+                )
 
-        last_end = end
+                last_end = value_end + 1
+                start = find("@![", last_end)
+                continue
+
+        start = find("@![", start + 1)
 
     # Add any remaining text after the last match
-    if last_end < len(content):
-        text_value: str = content[last_end:].strip()
-        if text_value:
-            parts.append(ContentPart(type="text", value=text_value))
+    if span := _text_span(content, last_end, len(content)):
+        spans.append(span)
+
+    return spans
+
+
+def _text_span(content: str, start: int, end: int) -> ContentPartSpan | None:
+    while start < end and content[start].isspace():
+        start += 1
+    while end > start and content[end - 1].isspace():
+        end -= 1
+    if start == end:
+        return None
+    return ContentPartSpan(CONTENT_TEXT_TYPE, start, end)
+
 
-    return parts
+def _content_part(type: str, value: str) -> ContentPart:
+    # Same as `ContentPart.model_construct`, without its per-field default
+    # handling, the values are plain strings that need no validation
+    if type not in ALL_CONTENT_TYPES:
+        logger.warning(f"Invalid content type: {type}")
+    part = object.__new__(ContentPart)
+    object.__setattr__(part, "__dict__", {"type": type, "value": value})
+    object.__setattr__(part, "__pydantic_fields_set__", {"type", "value"})
+    object.__setattr__(part, "__pydantic_extra__", None)
+    object.__setattr__(part, "__pydantic_private__", None)
+    return part
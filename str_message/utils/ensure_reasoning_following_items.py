@@ -0,0 +1,63 @@
+import logging
+import typing
+
+from str_message import AssistantMessage, Message, ReasoningMessage
+
+logger = logging.getLogger(__name__)
+
+
+class ReasoningRemovalReport(typing.NamedTuple):
+    """Reasoning messages removed, with their indexes before the removal."""
+
+    removed: typing.List[Message]
+    indexes: typing.List[int]
+
+    def __bool__(self) -> bool:
+        return bool(self.removed)
+
+
+def ensure_reasoning_following_items(
+    messages: typing.List[Message],
+    *,
+    start: int = 0,
+    keep_trailing: bool = False,
+) -> ReasoningRemovalReport:
+    """Remove reasoning messages not followed by an assistant message, in place.
+    Only messages from `start` are checked, with `keep_trailing` a reasoning
+    message at the end is kept, as its following item may not be added yet.
+    """
+    # To solve OpenAI error: Item 'rs_xxx' of type 'reasoning' was provided
+    # without its required following item.
+    report = ReasoningRemovalReport([], [])
+    last = len(messages) - 1
+    write = start
+
+    for idx in range(start, len(messages)):
+        msg = messages[idx]
+        if isinstance(msg, ReasoningMessage):
+            if idx == last:
+                if not keep_trailing:
+                    logger.warning(
+                        f"Removing reasoning message {msg.id} "
+                        + "because it is the last message"
+                    )
+                    report.removed.append(msg)
+                    report.indexes.append(idx)
+                    continue
+            # Must be before assistant message else remove it
+            elif not isinstance(messages[idx + 1], AssistantMessage):
+                logger.warning(
+                    f"Removing reasoning message {msg.id} "
+                    + "because it is not with correct following item"
+                )
+                report.removed.append(msg)
+                report.indexes.append(idx)
+                continue
+
+        if write != idx:
+            messages[write] = msg
+        write += 1
+
+    if report.removed:
+        del messages[write:]
+    return report
@@ -5,7 +5,9 @@ import durl
 import pydantic
 from openai.types.chat.chat_completion import ChatCompletion
 from openai.types.chat.chat_completion_message import ChatCompletionMessage
+from openai.types.responses import response_input_item, response_output_item
 from openai.types.responses.parsed_response import ParsedResponseOutputItem
+from openai.types.responses.response_input_item import ResponseInputItem
 from openai.types.responses.response_output_item import ResponseOutputItem
 
 from str_message import (
@@ -16,10 +18,88 @@ from str_message import (
     ResponseInputItemAdapter,
     ResponseInputItemModels,
     ResponseOutputItemAdapter,
+    ResponseOutputItemModels,
 )
 
 logger = logging.getLogger(__name__)
 
+DictDiscriminator: typing.TypeAlias = typing.Tuple[
+    typing.Literal["object", "type", "role"], str
+]
+
+
+class DictMessageRoute(typing.NamedTuple):
+    """A validation target and converter for one discriminated dict shape."""
+
+    item_type: typing.Any
+    converter: typing.Callable[[typing.Any], typing.List[MessageTypes]]
+
+
+DICT_MESSAGE_ROUTES: typing.Dict[DictDiscriminator, typing.List[DictMessageRoute]] = {}
+
+_response_input_item_models_as_output: typing.Dict[
+    typing.Type[pydantic.BaseModel], typing.Type[pydantic.BaseModel]
+] = {
+    response_input_item.ImageGenerationCall: response_output_item.ImageGenerationCall,
+    response_input_item.LocalShellCall: response_output_item.LocalShellCall,
+    response_input_item.McpApprovalRequest: response_output_item.McpApprovalRequest,
+    response_input_item.McpCall: response_output_item.McpCall,
+    response_input_item.McpListTools: response_output_item.McpListTools,
+}
+
+_type_adapters: typing.Dict[typing.Any, pydantic.TypeAdapter] = {
+    ResponseInputItem: ResponseInputItemAdapter,
+    ResponseOutputItem: ResponseOutputItemAdapter,
+    ParsedResponseOutputItem: ParsedResponseOutputItemAdapter,
+}
+
+
+def register_dict_message_route(
+    discriminator: DictDiscriminator,
+    item_type: typing.Any,
+    converter: typing.Callable[[typing.Any], typing.List[MessageTypes]],
+    *,
+    prepend: bool = False,
+) -> None:
+    """Register a dict shape so `message_from_any` can skip the cascade.
+    Routes of the same discriminator are tried in order until one validates.
+    """
+    routes = DICT_MESSAGE_ROUTES.setdefault(discriminator, [])
+    route = DictMessageRoute(item_type, converter)
+    if prepend:
+        routes.insert(0, route)
+    else:
+        routes.append(route)
+
+
+def dict_discriminator(data: typing.Dict) -> DictDiscriminator | None:
+    """Return the cheap discriminator of a raw dict payload, if any."""
+    if data.get("object") == "chat.completion" or "choices" in data:
+        return ("object", "chat.completion")
+    if isinstance(_type := data.get("type"), str):
+        return ("type", _type)
+    if isinstance(_role := data.get("role"), str):
+        return ("role", _role)
+    return None
+
+
+def validate_dict_message_route(
+    route: DictMessageRoute, data: typing.Any
+) -> typing.Any:
+    # Models are validated through their own validator, so patches applied
+    # by `model_rebuild` are always honoured.
+    if isinstance(route.item_type, type) and issubclass(
+        route.item_type, pydantic.BaseModel
+    ):
+        return route.item_type.model_validate(data)
+
+    adapter = _type_adapters.get(route.item_type)
+    if adapter is None:
+        adapter = _type_adapters[route.item_type] = pydantic.TypeAdapter(
+            route.item_type
+        )
+    return adapter.validate_python(data)
+
 
 def message_from_any(
     data: (
@@ -33,9 +113,6 @@ def message_from_any(
     from str_message.types.chat_completion_messages import (
         ChatCompletionMessage as ChatCompletionInputMessage,
     )
-    from str_message.types.chat_completion_messages import (
-        ChatCompletionMessageAdapter,
-    )
     from str_message.utils.message_from_chat_cmpl import (
         message_from_chat_cmpl,
     )
@@ -74,80 +151,226 @@ def message_from_any(
 
     # Chat completion input message model type
     if isinstance(data, ChatCompletionInputMessage):
-        return message_from_chat_cmpl_input_message(
-            ChatCompletionMessageAdapter.validate_json(data.model_dump_json())
-        )
-
-    # Response output item model type
-    if item := (
-        _return_response_output_item_model(data)
-        if isinstance(data, pydantic.BaseModel)
-        else None
-    ):
-        return message_from_response_output_item(item)
+        return message_from_chat_cmpl_input_message(data)
 
-    # Parsed response output item model type
-    if item := (
-        _return_parsed_response_output_item_model(data)
-        if isinstance(data, pydantic.BaseModel)
-        else None
-    ):
-        return message_from_response_output_item(item)
+    # Response output item model type, parsed items are subclasses
+    if isinstance(data, ResponseOutputItemModels):
+        return message_from_response_output_item(data)
 
     # Response input item model type
     if isinstance(data, ResponseInputItemModels):
-        return message_from_response_input_item(
-            ResponseInputItemAdapter.validate_json(data.model_dump_json())
-        )
+        # Input variants of output items keep the output item conversion
+        if output_model := _response_input_item_models_as_output.get(type(data)):
+            try:
+                return message_from_response_output_item(
+                    output_model.model_validate(data, from_attributes=True)
+                )
+            except pydantic.ValidationError:
+                pass  # Not a ResponseOutputItem
+        return message_from_response_input_item(data)
+
+    # Other model types shaped like a response output item
+    if isinstance(data, pydantic.BaseModel):
+        if item := _return_response_output_item_model(data):
+            return message_from_response_output_item(item)
+        if item := _return_parsed_response_output_item_model(data):
+            return message_from_response_output_item(item)
 
     # Handle dict type
     if isinstance(data, typing.Dict):
-        try:
-            chat_cmpl = ChatCompletion.model_validate(data)
-            return message_from_chat_cmpl(chat_cmpl)
-        except pydantic.ValidationError:
-            pass  # Not a ChatCompletion
+        return message_from_dict(data)
 
-        try:
-            chat_cmpl_message = ChatCompletionMessage.model_validate(data)
-            return message_from_chat_cmpl_message(chat_cmpl_message)
-        except pydantic.ValidationError:
-            pass  # Not a ChatCompletionMessage
+    raise ValueError(f"Unsupported message type: {type(data).__name__}, data: {data}")
 
-        try:
-            chat_cmpl_input_message = ChatCompletionMessageAdapter.validate_python(data)
-            return message_from_chat_cmpl_input_message(chat_cmpl_input_message)
-        except pydantic.ValidationError:
-            pass  # Not a ChatCompletionInputMessage
 
-        try:
-            response_input_item = ResponseInputItemAdapter.validate_python(data)
-            return message_from_response_input_item(response_input_item)
-        except pydantic.ValidationError:
-            pass  # Not a ResponseInputItem
+def message_from_dict(data: typing.Dict) -> typing.List[MessageTypes]:
+    """Convert a raw dict, dispatching on its discriminator before the cascade."""
+    discriminator = dict_discriminator(data)
+    routes = DICT_MESSAGE_ROUTES.get(discriminator, []) if discriminator else []
 
+    for route in routes:
         try:
-            response_output_item = ResponseOutputItemAdapter.validate_python(data)
-            return message_from_response_output_item(response_output_item)
+            return route.converter(validate_dict_message_route(route, data))
         except pydantic.ValidationError:
-            pass  # Not a ResponseOutputItem
+            pass  # Try next route
 
-        try:
-            parsed_response_output_item = (
-                ParsedResponseOutputItemAdapter.validate_python(data)
-            )
-            return message_from_response_output_item(parsed_response_output_item)
-        except pydantic.ValidationError:
-            pass  # Not a ParsedResponseOutputItem
+    # Ambiguous or unregistered shape
+    return _message_from_dict_cascade(data)
+
+
+def _message_from_dict_cascade(data: typing.Dict) -> typing.List[MessageTypes]:
+    from str_message.types.chat_completion_messages import (
+        ChatCompletionMessageAdapter,
+    )
+    from str_message.utils.message_from_chat_cmpl import (
+        message_from_chat_cmpl,
+    )
+    from str_message.utils.message_from_chat_cmpl_input_message import (
+        message_from_chat_cmpl_input_message,
+    )
+    from str_message.utils.message_from_chat_cmpl_message import (
+        message_from_chat_cmpl_message,
+    )
+    from str_message.utils.message_from_response_input_item import (
+        message_from_response_input_item,
+    )
+    from str_message.utils.message_from_response_output_item import (
+        message_from_response_output_item,
+    )
+
+    try:
+        chat_cmpl = ChatCompletion.model_validate(data)
+        return message_from_chat_cmpl(chat_cmpl)
+    except pydantic.ValidationError:
+        pass  # Not a ChatCompletion
+
+    try:
+        chat_cmpl_message = ChatCompletionMessage.model_validate(data)
+        return message_from_chat_cmpl_message(chat_cmpl_message)
+    except pydantic.ValidationError:
+        pass  # Not a ChatCompletionMessage
+
+    try:
+        chat_cmpl_input_message = ChatCompletionMessageAdapter.validate_python(data)
+        return message_from_chat_cmpl_input_message(chat_cmpl_input_message)
+    except pydantic.ValidationError:
+        pass  # Not a ChatCompletionInputMessage
+
+    try:
+        response_input_item = ResponseInputItemAdapter.validate_python(data)
+        return message_from_response_input_item(response_input_item)
+    except pydantic.ValidationError:
+        pass  # Not a ResponseInputItem
+
+    try:
+        response_output_item = ResponseOutputItemAdapter.validate_python(data)
+        return message_from_response_output_item(response_output_item)
+    except pydantic.ValidationError:
+        pass  # Not a ResponseOutputItem
+
+    try:
+        parsed_response_output_item = ParsedResponseOutputItemAdapter.validate_python(
+            data
+        )
+        return message_from_response_output_item(parsed_response_output_item)
+    except pydantic.ValidationError:
+        pass  # Not a ParsedResponseOutputItem
 
     raise ValueError(f"Unsupported message type: {type(data).__name__}, data: {data}")
 
 
+def _register_default_dict_message_routes() -> None:
+    from openai.types.responses import response_output_item
+    from openai.types.responses.easy_input_message import EasyInputMessage
+    from openai.types.responses.response_code_interpreter_tool_call import (
+        ResponseCodeInterpreterToolCall,
+    )
+    from openai.types.responses.response_computer_tool_call import (
+        ResponseComputerToolCall,
+    )
+    from openai.types.responses.response_custom_tool_call import (
+        ResponseCustomToolCall,
+    )
+    from openai.types.responses.response_file_search_tool_call import (
+        ResponseFileSearchToolCall,
+    )
+    from openai.types.responses.response_function_tool_call import (
+        ResponseFunctionToolCall,
+    )
+    from openai.types.responses.response_function_web_search import (
+        ResponseFunctionWebSearch,
+    )
+    from openai.types.responses.response_output_message import (
+        ResponseOutputMessage,
+    )
+    from openai.types.responses.response_reasoning_item import (
+        ResponseReasoningItem,
+    )
+
+    from str_message.types.chat_completion_messages import (
+        ChatCompletionMessage as ChatCompletionInputMessage,
+    )
+    from str_message.types.chat_completion_messages import (
+        ChatCompletionMessageAdapter,
+    )
+    from str_message.utils.message_from_chat_cmpl import (
+        message_from_chat_cmpl,
+    )
+    from str_message.utils.message_from_chat_cmpl_input_message import (
+        message_from_chat_cmpl_input_message,
+    )
+    from str_message.utils.message_from_chat_cmpl_message import (
+        message_from_chat_cmpl_message,
+    )
+    from str_message.utils.message_from_response_input_item import (
+        message_from_response_input_item,
+    )
+    from str_message.utils.message_from_response_output_item import (
+        message_from_response_output_item,
+    )
+
+    _type_adapters[ChatCompletionInputMessage] = ChatCompletionMessageAdapter
+
+    # Chat completion, keep the cascade order for each role
+    register_dict_message_route(
+        ("object", "chat.completion"), ChatCompletion, message_from_chat_cmpl
+    )
+    register_dict_message_route(
+        ("role", "assistant"), ChatCompletionMessage, message_from_chat_cmpl_message
+    )
+    for role in ("assistant", "developer", "system", "user", "tool", "function"):
+        register_dict_message_route(
+            ("role", role),
+            ChatCompletionInputMessage,
+            message_from_chat_cmpl_input_message,
+        )
+    # Response input messages, each model on its own instead of the union
+    for role in ("assistant", "developer", "system", "user"):
+        register_dict_message_route(
+            ("role", role), EasyInputMessage, message_from_response_input_item
+        )
+    for role in ("developer", "system", "user"):
+        register_dict_message_route(
+            ("role", role),
+            response_input_item.Message,
+            message_from_response_input_item,
+        )
+
+    # Response input items, output messages need the "message" type
+    for item_type, item_model in (
+        ("message", EasyInputMessage),
+        ("message", ResponseOutputMessage),
+        ("message", response_input_item.Message),
+        ("function_call", ResponseFunctionToolCall),
+        ("function_call_output", response_input_item.FunctionCallOutput),
+        ("reasoning", ResponseReasoningItem),
+        ("mcp_list_tools", response_input_item.McpListTools),
+        ("mcp_call", response_input_item.McpCall),
+    ):
+        register_dict_message_route(
+            ("type", item_type), item_model, message_from_response_input_item
+        )
+
+    # Response output items not handled by the input item converter
+    for item_type, item_model in (
+        ("file_search_call", ResponseFileSearchToolCall),
+        ("web_search_call", ResponseFunctionWebSearch),
+        ("computer_call", ResponseComputerToolCall),
+        ("image_generation_call", response_output_item.ImageGenerationCall),
+        ("code_interpreter_call", ResponseCodeInterpreterToolCall),
+        ("local_shell_call", response_output_item.LocalShellCall),
+        ("custom_tool_call", ResponseCustomToolCall),
+    ):
+        register_dict_message_route(
+            ("type", item_type), item_model, message_from_response_output_item
+        )
+
+
 def _return_response_output_item_model(
     data: pydantic.BaseModel,
 ) -> ResponseOutputItem | None:
     try:
-        return ResponseOutputItemAdapter.validate_json(data.model_dump_json())
+        return ResponseOutputItemAdapter.validate_python(data, from_attributes=True)
     except pydantic.ValidationError:
         return None
 
@@ -156,6 +379,11 @@ def _return_parsed_response_output_item_model(
     data: pydantic.BaseModel,
 ) -> ParsedResponseOutputItem | None:
     try:
-        return ParsedResponseOutputItemAdapter.validate_json(data.model_dump_json())
+        return ParsedResponseOutputItemAdapter.validate_python(
+            data, from_attributes=True
+        )
     except pydantic.ValidationError:
         return None
+
+
+_register_default_dict_message_routes()
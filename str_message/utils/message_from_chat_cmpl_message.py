@@ -36,7 +36,8 @@ def message_from_chat_cmpl_message(
             )
             return [
                 ToolCallMessage(
-                    id=msg_id,
+                    # Ids the tool call, same as streamed and response tool calls
+                    id=_tool_call.id,
                     role="assistant",
                     content=(
                         f"[tool_call:{_tool_call.function.name}]"
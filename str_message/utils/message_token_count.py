@@ -0,0 +1,62 @@
+import logging
+import typing
+
+from str_message import (
+    CONTENT_TEXT_TYPE,
+    McpCallMessage,
+    McpListToolsMessage,
+    MessageTypes,
+    ReasoningMessage,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+)
+
+if typing.TYPE_CHECKING:
+    import tiktoken
+
+logger = logging.getLogger(__name__)
+
+# Estimates in the style of the OpenAI cookbook, every message is wrapped in
+# a few format tokens, and a non-text part, e.g. a low detail image, costs a
+# fixed amount instead of the length of its data URL
+MESSAGE_OVERHEAD_TOKENS = 3
+CONTENT_PART_TOKENS = 85
+
+
+def message_token_count(message: MessageTypes, encoding: "tiktoken.Encoding") -> int:
+    """Estimate the tokens a message takes in the context window."""
+    tokens = MESSAGE_OVERHEAD_TOKENS
+
+    if isinstance(message, ToolCallMessage):
+        texts = [message.tool_name, message.tool_call_arguments]
+    elif isinstance(message, ToolCallOutputMessage):
+        texts = [message.content]
+    elif isinstance(message, McpCallMessage):
+        texts = [message.mcp_call_name, message.mcp_call_arguments, message.content]
+    elif isinstance(message, McpListToolsMessage):
+        texts = [tool.model_dump_json() for tool in message.mcp_tools]
+    elif isinstance(message, ReasoningMessage):
+        texts = [message.content]
+    else:
+        texts = []
+        for content_part in message.content_parts:
+            if content_part.type == CONTENT_TEXT_TYPE:
+                texts.append(content_part.value)
+            else:
+                tokens += CONTENT_PART_TOKENS
+
+    for text in texts:
+        if text:
+            tokens += len(encoding.encode(text, disallowed_special=()))
+    return tokens
+
+
+def get_token_encoding(
+    encoding: typing.Union["tiktoken.Encoding", str],
+) -> "tiktoken.Encoding":
+    """Return the encoding, names are loaded with `tiktoken.get_encoding`."""
+    if isinstance(encoding, str):
+        import tiktoken
+
+        return tiktoken.get_encoding(encoding)
+    return encoding
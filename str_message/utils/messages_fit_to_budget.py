@@ -0,0 +1,135 @@
+import logging
+import typing
+
+from str_message import (
+    DeveloperMessage,
+    MessageTypes,
+    SystemMessage,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+    UserMessage,
+)
+
+logger = logging.getLogger(__name__)
+
+FitToBudgetStrategy: typing.TypeAlias = typing.Literal["drop_oldest", "summarize"]
+
+
+def messages_fit_to_budget(
+    messages: typing.List[MessageTypes],
+    token_counts: typing.List[int],
+    max_tokens: int,
+    *,
+    strategy: FitToBudgetStrategy = "drop_oldest",
+    summarize: (
+        typing.Callable[[typing.List[MessageTypes]], MessageTypes | str] | None
+    ) = None,
+    token_count: typing.Callable[[MessageTypes], int] | None = None,
+) -> typing.Tuple[typing.List[MessageTypes], typing.List[MessageTypes]]:
+    """Drop, or summarize, the oldest turns until the messages fit the budget.
+    Leading instructions and the latest turn are kept, turns are dropped whole
+    so tool calls stay with their outputs and reasoning with its next item.
+    A previous summary is dropped like a turn, and summarized with the next
+    ones. Returns the kept and the removed messages.
+    """
+    if strategy == "summarize" and (summarize is None or token_count is None):
+        raise ValueError("The summarize strategy requires summarize and token_count")
+
+    total = sum(token_counts)
+    if total <= max_tokens:
+        return list(messages), []
+
+    pinned_end = 0
+    while (
+        pinned_end < len(messages)
+        and isinstance(messages[pinned_end], (SystemMessage, DeveloperMessage))
+        and not _is_summary_message(messages[pinned_end])
+    ):
+        pinned_end += 1
+    units = _turn_units(messages, pinned_end)
+
+    # Drop the oldest units, always keep the latest one
+    dropped_units = 0
+    while total > max_tokens and dropped_units < len(units) - 1:
+        start, end = units[dropped_units]
+        total -= sum(token_counts[start:end])
+        dropped_units += 1
+
+    summary: MessageTypes | None = None
+    if strategy == "summarize" and dropped_units:
+        while True:
+            dropped = messages[pinned_end : units[dropped_units - 1][1]]
+            summary = _summary_message(summarize(dropped))  # type: ignore[misc]
+            summary_tokens = token_count(summary)  # type: ignore[misc]
+            if total + summary_tokens <= max_tokens:
+                break
+            if dropped_units >= len(units) - 1:
+                break
+            start, end = units[dropped_units]
+            total -= sum(token_counts[start:end])
+            dropped_units += 1
+        total += summary_tokens
+
+    if total > max_tokens:
+        logger.warning(
+            f"Messages take {total} tokens after trimming, over the budget of "
+            + f"{max_tokens} tokens"
+        )
+
+    drop_end = units[dropped_units - 1][1] if dropped_units else pinned_end
+    kept = list(messages[:pinned_end])
+    if summary is not None:
+        kept.append(summary)
+    kept.extend(messages[drop_end:])
+    return kept, list(messages[pinned_end:drop_end])
+
+
+def _turn_units(
+    messages: typing.List[MessageTypes], start: int
+) -> typing.List[typing.Tuple[int, int]]:
+    # A turn starts at a user message, turns are merged when a tool call and
+    # its output are in different turns
+    turn_starts: typing.List[int] = []
+    tool_call_turns: typing.Dict[str, int] = {}
+    merge_from: typing.Dict[int, int] = {}
+
+    for idx in range(start, len(messages)):
+        message = messages[idx]
+        if not turn_starts or isinstance(message, UserMessage):
+            turn_starts.append(idx)
+        turn = len(turn_starts) - 1
+
+        if isinstance(message, ToolCallMessage):
+            tool_call_turns[message.tool_call_id] = turn
+        elif isinstance(message, ToolCallOutputMessage):
+            call_turn = tool_call_turns.get(message.tool_call_id, turn)
+            if call_turn < turn:
+                merge_from[turn] = min(merge_from.get(turn, turn), call_turn)
+
+    turn_ends = turn_starts[1:] + [len(messages)]
+    units: typing.List[typing.Tuple[int, int]] = []
+    first_turn = len(turn_starts)
+    for turn in range(len(turn_starts) - 1, -1, -1):
+        first_turn = min(first_turn, merge_from.get(turn, turn))
+        if first_turn == turn:
+            units.append((turn_starts[turn], _unit_end(units, turn_ends[turn])))
+            first_turn = len(turn_starts)
+    units.reverse()
+    return units
+
+
+def _unit_end(units: typing.List[typing.Tuple[int, int]], turn_end: int) -> int:
+    # Units are collected backwards, a unit ends where the next one starts
+    return units[-1][0] if units else turn_end
+
+
+def _is_summary_message(message: MessageTypes) -> bool:
+    return (message.metadata or {}).get("is_summary") == "true"
+
+
+def _summary_message(summary: MessageTypes | str) -> MessageTypes:
+    # Not a system message, so the summary is not pinned as instructions
+    if isinstance(summary, str):
+        return UserMessage(content=summary, metadata={"is_summary": "true"})
+    summary.metadata = {**(summary.metadata or {}), "is_summary": "true"}
+    return summary
@@ -0,0 +1,55 @@
+import json
+import logging
+import pathlib
+import typing
+
+from str_message import MessageTypes
+
+logger = logging.getLogger(__name__)
+
+
+def messages_gen_from_jsonl(
+    source: pathlib.Path | str | typing.IO[bytes],
+    *,
+    chunk_size: int | None = None,
+) -> typing.Generator[MessageTypes, None, None]:
+    """Lazily convert a JSONL log of raw items into Message objects.
+    Lines are read one by one, with `chunk_size` they are validated in batches.
+    """
+    if isinstance(source, (str, pathlib.Path)):
+        with open(source, "rb") as f:
+            yield from _messages_gen_from_jsonl_lines(f, chunk_size=chunk_size)
+    else:
+        yield from _messages_gen_from_jsonl_lines(source, chunk_size=chunk_size)
+
+
+def _messages_gen_from_jsonl_lines(
+    lines: typing.Iterable[bytes],
+    *,
+    chunk_size: int | None = None,
+) -> typing.Generator[MessageTypes, None, None]:
+    from str_message.utils.message_from_any import message_from_any
+    from str_message.utils.messages_from_many import messages_from_many
+
+    chunk: typing.List[typing.Any] = []
+
+    for line_no, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON at line {line_no}: {e}") from e
+
+        if not chunk_size or chunk_size <= 1:
+            yield from message_from_any(item)
+            continue
+
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield from messages_from_many(chunk)
+            chunk.clear()
+
+    if chunk:
+        yield from messages_from_many(chunk)
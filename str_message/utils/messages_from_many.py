@@ -0,0 +1,100 @@
+import logging
+import typing
+
+import pydantic
+
+from str_message import MessageTypes
+from str_message.utils.message_from_any import (
+    DICT_MESSAGE_ROUTES,
+    DictDiscriminator,
+    DictMessageRoute,
+    dict_discriminator,
+    message_from_any,
+    message_from_dict,
+)
+
+logger = logging.getLogger(__name__)
+
+_list_type_adapters: typing.Dict[typing.Any, pydantic.TypeAdapter] = {}
+
+
+def messages_from_many(data: typing.Iterable[typing.Any]) -> typing.List[MessageTypes]:
+    """Convert many items into Message objects, keeping the input order.
+    Dicts of the same shape are validated together in one list validation.
+    """
+    items = list(data)
+
+    # Group dict items by shape
+    groups: typing.Dict[DictDiscriminator, typing.List[int]] = {}
+    for idx, item in enumerate(items):
+        if isinstance(item, typing.Dict):
+            discriminator = dict_discriminator(item)
+            if discriminator in DICT_MESSAGE_ROUTES:
+                groups.setdefault(discriminator, []).append(idx)
+
+    # Validate each group in one shot, leftovers try the next route
+    validated: typing.Dict[int, typing.Tuple[DictMessageRoute, typing.Any]] = {}
+    for discriminator, indexes in groups.items():
+        for route in DICT_MESSAGE_ROUTES[discriminator]:
+            if not indexes:
+                break
+            validated_items, indexes = _validate_route_batch(
+                route, [items[idx] for idx in indexes], indexes
+            )
+            for idx, validated_item in validated_items.items():
+                validated[idx] = (route, validated_item)
+
+    # Convert in order, tool calls must be seen before their outputs
+    output: typing.List[MessageTypes] = []
+    for idx, item in enumerate(items):
+        if idx in validated:
+            route, validated_item = validated[idx]
+            try:
+                output.extend(route.converter(validated_item))
+                continue
+            except pydantic.ValidationError:
+                pass  # Convert again from the raw dict
+
+        if isinstance(item, typing.Dict):
+            output.extend(message_from_dict(item))
+        else:
+            output.extend(message_from_any(item))
+
+    return output
+
+
+def _validate_route_batch(
+    route: DictMessageRoute,
+    batch: typing.List[typing.Any],
+    indexes: typing.List[int],
+) -> typing.Tuple[typing.Dict[int, typing.Any], typing.List[int]]:
+    adapter = _list_type_adapter(route.item_type)
+    try:
+        return dict(zip(indexes, adapter.validate_python(batch))), []
+    except pydantic.ValidationError as e:
+        failed = {
+            error["loc"][0] for error in e.errors() if isinstance(error["loc"][0], int)
+        } or set(range(len(batch)))
+
+    # Validate the rest again, only the failed items are left for the next route
+    passed = [pos for pos in range(len(batch)) if pos not in failed]
+    validated_items: typing.Dict[int, typing.Any] = {}
+    if passed:
+        validated_items = dict(
+            zip(
+                (indexes[pos] for pos in passed),
+                adapter.validate_python([batch[pos] for pos in passed]),
+            )
+        )
+    return validated_items, [indexes[pos] for pos in sorted(failed)]
+
+
+def _list_type_adapter(item_type: typing.Any) -> pydantic.TypeAdapter:
+    # Models rebuilt by patches get a new validator, so key on it as well
+    key = (item_type, id(getattr(item_type, "__pydantic_validator__", None)))
+    adapter = _list_type_adapters.get(key)
+    if adapter is None:
+        adapter = _list_type_adapters[key] = pydantic.TypeAdapter(
+            typing.List[item_type]
+        )
+    return adapter
@@ -0,0 +1,44 @@
+import logging
+import typing
+
+import agents
+
+from str_message import MessageTypes
+
+if typing.TYPE_CHECKING:
+    from str_message import Conversation
+    from str_message.types.response_stream_builder import ResponseStreamBuilder
+
+logger = logging.getLogger(__name__)
+
+
+async def messages_gen_from_agents_stream(
+    stream: agents.RunResultStreaming | typing.AsyncIterable[agents.StreamEvent],
+    *,
+    conversation: typing.Optional["Conversation"] = None,
+    builder: typing.Optional["ResponseStreamBuilder"] = None,
+) -> typing.AsyncGenerator[MessageTypes, None]:
+    """Yield messages of an Agents SDK streamed run as each item is created.
+    Messages are added to `conversation` before they are yielded. Raw
+    response events are passed to `builder`, for partial messages of items
+    still streaming.
+    """
+    from str_message.utils.message_from_any import message_from_any
+
+    events = (
+        stream.stream_events()
+        if isinstance(stream, agents.RunResultStreaming)
+        else stream
+    )
+    async for event in events:
+        if isinstance(event, agents.RunItemStreamEvent):
+            # The raw SDK item, converted by its class without a dict round trip
+            messages = message_from_any(event.item.raw_item)
+            if conversation is not None:
+                conversation.add_message(messages)
+            for message in messages:
+                yield message
+
+        elif isinstance(event, agents.RawResponsesStreamEvent):
+            if builder is not None:
+                builder.add(event.data)
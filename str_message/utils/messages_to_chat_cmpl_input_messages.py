@@ -52,6 +52,7 @@ from str_message import (
     ToolCallOutputMessage,
     UserMessage,
 )
+from str_message.utils.resolve_blob_url import resolve_blob_url
 
 
 def messages_to_chat_cmpl_input_messages(
@@ -80,7 +81,9 @@ def messages_gen_chat_cmpl_input_messages(
                             ChatCompletionContentPartInputAudioParam(
                                 type="input_audio",
                                 input_audio=InputAudio(
-                                    data=durl.DataURL.from_url(content_part.value).data,
+                                    data=durl.DataURL.from_url(
+                                        resolve_blob_url(content_part.value)
+                                    ).data,
                                     format="wav",
                                 ),
                             )
@@ -92,7 +95,9 @@ def messages_gen_chat_cmpl_input_messages(
                         content=[
                             ChatCompletionContentPartImageParam(
                                 type="image_url",
-                                image_url=ImageURL(url=content_part.value),
+                                image_url=ImageURL(
+                                    url=resolve_blob_url(content_part.value)
+                                ),
                             )
                         ],
                     )
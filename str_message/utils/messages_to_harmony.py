@@ -1,6 +1,8 @@
 # https://cookbook.openai.com/articles/openai-harmony
+import array
 import json
 import logging
+import threading
 import typing
 from datetime import datetime, timezone
 
@@ -10,11 +12,13 @@ from openai_harmony import (
     Author,
     Conversation,
     DeveloperContent,
+    HarmonyEncoding,
     HarmonyEncodingName,
 )
 from openai_harmony import Message as HarmonyMessage
 from openai_harmony import (
     ReasoningEffort,
+    RenderOptions,
     Role,
     SystemContent,
     ToolDescription,
@@ -36,8 +40,70 @@ from str_message import (
 
 logger = logging.getLogger(__name__)
 
-tiktoken_encoding = tiktoken.encoding_for_model("gpt-oss-120b")
-harmony_encoding = load_harmony_encoding(HarmonyEncodingName.HARMONY_GPT_OSS)
+
+class HarmonyTokenSpan(typing.NamedTuple):
+    """Tokens of the message at `index` of the rendered messages."""
+
+    index: int
+    start: int
+    end: int
+
+
+class HarmonyTokens(typing.NamedTuple):
+    """Rendered token ids, `tokens[:header_end]` are the system and developer
+    header. Messages without own tokens, e.g. merged into the header or dropped
+    analysis, have no span. `numpy.frombuffer(tokens, dtype=numpy.uint32)`
+    views the ids without a copy.
+    """
+
+    tokens: array.array
+    header_end: int
+    spans: typing.List[HarmonyTokenSpan]
+
+
+_encodings_lock = threading.Lock()
+_tiktoken_encoding: tiktoken.Encoding | None = None
+_harmony_encoding: HarmonyEncoding | None = None
+
+
+def get_tiktoken_encoding() -> tiktoken.Encoding:
+    """Return the process-wide gpt-oss tiktoken encoding, loaded on first use."""
+    global _tiktoken_encoding
+    if _tiktoken_encoding is None:
+        with _encodings_lock:
+            if _tiktoken_encoding is None:
+                _tiktoken_encoding = tiktoken.encoding_for_model("gpt-oss-120b")
+    return _tiktoken_encoding
+
+
+def get_harmony_encoding() -> HarmonyEncoding:
+    """Return the process-wide Harmony encoding, loaded on first use."""
+    global _harmony_encoding
+    if _harmony_encoding is None:
+        with _encodings_lock:
+            if _harmony_encoding is None:
+                _harmony_encoding = load_harmony_encoding(
+                    HarmonyEncodingName.HARMONY_GPT_OSS
+                )
+    return _harmony_encoding
+
+
+def warm_up_harmony_encodings(*, tiktoken_encoding: bool = False) -> None:
+    """Load the encodings ahead of the first render, e.g. at server startup.
+    Rendering only needs the Harmony encoding, tiktoken is loaded on request.
+    """
+    get_harmony_encoding()
+    if tiktoken_encoding:
+        get_tiktoken_encoding()
+
+
+def __getattr__(name: str) -> typing.Any:
+    # Module attributes of earlier versions, now loaded on first access
+    if name == "tiktoken_encoding":
+        return get_tiktoken_encoding()
+    if name == "harmony_encoding":
+        return get_harmony_encoding()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def messages_to_harmony(
@@ -47,7 +113,44 @@ def messages_to_harmony(
     conversation_start_date: str | None = None,
     tools: typing.List[FunctionDefinition] | None = None,
 ) -> typing.Dict:
+    harmony_conversation = messages_to_harmony_conversation(
+        messages,
+        reasoning_effort=reasoning_effort,
+        conversation_start_date=conversation_start_date,
+        tools=tools,
+    )
+
+    return json.loads(json.dumps(harmony_conversation.to_dict()))
+
+
+def messages_to_harmony_conversation(
+    messages: typing.List[MessageTypes],
+    *,
+    reasoning_effort: ReasoningEffort = ReasoningEffort.HIGH,
+    conversation_start_date: str | None = None,
+    tools: typing.List[FunctionDefinition] | None = None,
+) -> Conversation:
+    """Build the Harmony conversation, ready to render, from messages."""
+    harmony_conversation, _ = _harmony_conversation(
+        messages,
+        reasoning_effort=reasoning_effort,
+        conversation_start_date=conversation_start_date,
+        tools=tools,
+    )
+    return harmony_conversation
+
+
+def _harmony_conversation(
+    messages: typing.List[MessageTypes],
+    *,
+    reasoning_effort: ReasoningEffort,
+    conversation_start_date: str | None,
+    tools: typing.List[FunctionDefinition] | None,
+) -> typing.Tuple[Conversation, typing.List[int | None]]:
+    # Also returns the index of the source message of each Harmony message,
+    # None for the system and developer header
     harmony_messages: typing.List[HarmonyMessage] = []
+    sources: typing.List[int | None] = [None, None]
 
     system_message = (
         SystemContent.new()
@@ -71,76 +174,189 @@ def messages_to_harmony(
             ToolDescription.new(tool.name, tool.description or "", tool.parameters)
         )
 
-    for m in messages:
+    for idx, m in enumerate(messages):
 
-        if isinstance(m, SystemMessage):
+        if isinstance(m, (SystemMessage, DeveloperMessage)):
             developer_message.with_instructions(m.content)
 
-        elif isinstance(m, DeveloperMessage):
-            developer_message.with_instructions(m.content)
+        elif isinstance(m, McpListToolsMessage):
+            tools_descriptions.extend(_mcp_tools_descriptions(m))
 
-        elif isinstance(m, UserMessage):
-            harmony_messages.append(
-                HarmonyMessage.from_role_and_content(Role(m.role), m.content)
-            )
+        elif (harmony_message := _harmony_message(m)) is not None:
+            harmony_messages.append(harmony_message)
+            sources.append(idx)
 
-        elif isinstance(m, AssistantMessage):
-            harmony_messages.append(
-                HarmonyMessage.from_role_and_content(Role(m.role), m.content)
-            )
+    if tools_descriptions:
+        developer_message.with_function_tools(tools_descriptions)
 
-        elif isinstance(m, ToolCallMessage):
-            harmony_messages.append(
-                HarmonyMessage.from_role_and_content(
-                    Role(m.role), m.tool_call_arguments
-                )
-                .with_channel(m.channel)
-                .with_recipient(f"functions.{m.tool_name}")
-                .with_content_type("<|constrain|> json"),
-            )
-
-        elif isinstance(m, ToolCallOutputMessage):
-            harmony_messages.append(
-                HarmonyMessage.from_author_and_content(
-                    Author.new(Role(m.role), f"functions.{m.tool_name}"),
-                    m.content,
-                ).with_channel(m.channel),
-            )
+    return Conversation.from_messages(harmony_messages), sources
 
-        elif isinstance(m, McpListToolsMessage):
-            for mcp_tool in m.mcp_tools:
-                tools_descriptions.append(
-                    ToolDescription.new(
-                        mcp_tool.name,
-                        mcp_tool.description or "",
-                        mcp_tool.input_schema,  # type: ignore
-                    )
-                )
 
-        elif isinstance(m, McpCallMessage):
-            harmony_messages.append(
-                HarmonyMessage.from_author_and_content(
-                    Author.new(Role(m.role), f"functions.{m.mcp_call_name}"),
-                    m.content,
-                ).with_channel(m.channel),
-            )
+def _mcp_tools_descriptions(m: McpListToolsMessage) -> typing.List[ToolDescription]:
+    return [
+        ToolDescription.new(
+            mcp_tool.name,
+            mcp_tool.description or "",
+            mcp_tool.input_schema,  # type: ignore
+        )
+        for mcp_tool in m.mcp_tools
+    ]
 
-        elif isinstance(m, ReasoningMessage):
-            harmony_messages.append(
-                HarmonyMessage.from_role_and_content(
-                    Role.ASSISTANT, m.content
-                ).with_channel(m.channel)
-            )
 
-        else:
-            logger.warning(f"Unsupported message type: {type(m)}")
+def _harmony_message(m: MessageTypes) -> HarmonyMessage | None:
+    """Convert a conversation turn, messages of the header are not turns."""
+    if isinstance(m, UserMessage):
+        return HarmonyMessage.from_role_and_content(Role(m.role), m.content)
 
-    if tools_descriptions:
-        developer_message.with_function_tools(tools_descriptions)
+    elif isinstance(m, AssistantMessage):
+        return HarmonyMessage.from_role_and_content(Role(m.role), m.content)
 
-    harmony_conversation = Conversation.from_messages(harmony_messages)
+    elif isinstance(m, ToolCallMessage):
+        return (
+            HarmonyMessage.from_role_and_content(Role(m.role), m.tool_call_arguments)
+            .with_channel(m.channel)
+            .with_recipient(f"functions.{m.tool_name}")
+            .with_content_type("<|constrain|> json")
+        )
+
+    elif isinstance(m, ToolCallOutputMessage):
+        return HarmonyMessage.from_author_and_content(
+            Author.new(Role(m.role), f"functions.{m.tool_name}"),
+            m.content,
+        ).with_channel(m.channel)
+
+    elif isinstance(m, McpCallMessage):
+        return HarmonyMessage.from_author_and_content(
+            Author.new(Role(m.role), f"functions.{m.mcp_call_name}"),
+            m.content,
+        ).with_channel(m.channel)
+
+    elif isinstance(m, ReasoningMessage):
+        return HarmonyMessage.from_role_and_content(
+            Role.ASSISTANT, m.content
+        ).with_channel(m.channel)
+
+    else:
+        logger.warning(f"Unsupported message type: {type(m)}")
+        return None
+
+
+def messages_to_harmony_tokens(
+    messages: typing.List[MessageTypes],
+    *,
+    reasoning_effort: ReasoningEffort = ReasoningEffort.HIGH,
+    conversation_start_date: str | None = None,
+    tools: typing.List[FunctionDefinition] | None = None,
+) -> typing.List[int]:
+    """Render messages to Harmony token ids, e.g. for a local inference server."""
+    harmony_conversation = messages_to_harmony_conversation(
+        messages,
+        reasoning_effort=reasoning_effort,
+        conversation_start_date=conversation_start_date,
+        tools=tools,
+    )
+
+    return get_harmony_encoding().render_conversation(harmony_conversation)
+
+
+def messages_to_harmony_token_array(
+    messages: typing.List[MessageTypes],
+    *,
+    reasoning_effort: ReasoningEffort = ReasoningEffort.HIGH,
+    conversation_start_date: str | None = None,
+    tools: typing.List[FunctionDefinition] | None = None,
+) -> HarmonyTokens:
+    """Render messages to a compact `array('I')` of token ids with the token
+    span of each message, so budgeting and prefix caching need no re-tokenizing.
+    """
+    harmony_conversation, sources = _harmony_conversation(
+        messages,
+        reasoning_effort=reasoning_effort,
+        conversation_start_date=conversation_start_date,
+        tools=tools,
+    )
+    encoding = get_harmony_encoding()
+    tokens = array.array("I", encoding.render_conversation(harmony_conversation))
+    bounds = _harmony_message_bounds(encoding, harmony_conversation, tokens)
+
+    spans = [
+        HarmonyTokenSpan(source, *bound)
+        for source, bound in zip(sources, bounds)
+        if source is not None and bound is not None
+    ]
+    return HarmonyTokens(tokens, spans[0].start if spans else len(tokens), spans)
+
+
+def _harmony_message_bounds(
+    encoding: HarmonyEncoding,
+    harmony_conversation: Conversation,
+    tokens: array.array,
+) -> typing.List[typing.Tuple[int, int] | None]:
+    # Every rendered message starts with the <|start|> token
+    start_token = encoding.encode("<|start|>", allowed_special={"<|start|>"})[0]
+    starts: typing.List[int] = []
+    try:
+        pos = tokens.index(start_token)
+        while True:
+            starts.append(pos)
+            pos = tokens.index(start_token, pos + 1)
+    except ValueError:
+        pass
+    ends = starts[1:] + [len(tokens)]
+
+    # Same as the default `auto_drop_analysis`, analysis messages before the
+    # last final message are not rendered
+    harmony_messages = harmony_conversation.messages
+    last_final = max(
+        (idx for idx, m in enumerate(harmony_messages) if m.channel == "final"),
+        default=-1,
+    )
+    rendered = [
+        idx
+        for idx, m in enumerate(harmony_messages)
+        if not (idx < last_final and m.channel == "analysis")
+    ]
+    if len(rendered) != len(starts):
+        return _harmony_message_bounds_by_search(encoding, harmony_conversation, tokens)
+
+    bounds: typing.List[typing.Tuple[int, int] | None] = [None] * len(harmony_messages)
+    for idx, start, end in zip(rendered, starts, ends):
+        bounds[idx] = (start, end)
+    return bounds
+
+
+def _harmony_message_bounds_by_search(
+    encoding: HarmonyEncoding,
+    harmony_conversation: Conversation,
+    tokens: array.array,
+) -> typing.List[typing.Tuple[int, int] | None]:
+    # Slow path, render each message on its own and find it in the tokens
+    options = RenderOptions(
+        conversation_has_function_tools=_has_function_tools(harmony_conversation)
+    )
+    haystack = tokens.tobytes()
+    bounds: typing.List[typing.Tuple[int, int] | None] = []
+    pos = 0
+    for m in harmony_conversation.messages:
+        needle = array.array("I", encoding.render(m, options)).tobytes()
+        found = haystack.find(needle, pos * tokens.itemsize) if needle else -1
+        while found != -1 and found % tokens.itemsize:
+            found = haystack.find(needle, found + 1)
+        if found == -1:
+            bounds.append(None)
+            continue
+        start = found // tokens.itemsize
+        pos = start + len(needle) // tokens.itemsize
+        bounds.append((start, pos))
+    return bounds
 
-    return json.loads(json.dumps(harmony_conversation.to_dict()))
+
+def _has_function_tools(harmony_conversation: Conversation) -> bool:
+    for m in harmony_conversation.messages:
+        for content in m.content:
+            if isinstance(content, DeveloperContent) and content.tools:
+                return True
+    return False
 
 
 def messages_to_harmony_str(
@@ -150,21 +366,154 @@ def messages_to_harmony_str(
     conversation_start_date: str | None = None,
     tools: typing.List[FunctionDefinition] | None = None,
 ) -> str:
-
-    harmony_conversation_dict = messages_to_harmony(
+    tokens = messages_to_harmony_tokens(
         messages,
         reasoning_effort=reasoning_effort,
         conversation_start_date=conversation_start_date,
         tools=tools,
     )
-    harmony_conversation = Conversation.from_json(json.dumps(harmony_conversation_dict))
 
-    tokens = harmony_encoding.render_conversation(harmony_conversation)
+    return harmony_tokens_to_str(tokens)
 
-    harmony_prompt = tiktoken_encoding.decode(tokens)
+
+def harmony_tokens_to_str(tokens: typing.Sequence[int]) -> str:
+    """Decode rendered Harmony tokens into a readable prompt."""
+    harmony_prompt = get_harmony_encoding().decode(tokens)
 
     return (
         harmony_prompt.replace("<|end|>", "<|end|>\n\n")
         .replace("<|call|>", "<|call|>\n\n")
         .strip()
     )
+
+
+class HarmonyRenderer:
+    """Render a growing conversation, keeping the rendered token prefix.
+    Only messages appended since the last render are rendered. Any change of
+    the header, i.e. instructions, tools, reasoning effort or date, or of an
+    earlier message falls back to a full render.
+    """
+
+    def __init__(
+        self,
+        *,
+        reasoning_effort: ReasoningEffort = ReasoningEffort.HIGH,
+        conversation_start_date: str | None = None,
+        tools: typing.List[FunctionDefinition] | None = None,
+    ):
+        self.reasoning_effort = reasoning_effort
+        self.conversation_start_date = conversation_start_date
+        self.tools = tools
+
+        self.full_renders: int = 0
+        self.incremental_renders: int = 0
+
+        self._header_key: typing.Tuple[typing.Any, ...] | None = None
+        self._snapshots: typing.List[
+            typing.Tuple[typing.Type[MessageTypes], typing.Dict[str, typing.Any]]
+        ] = []
+        self._tokens = array.array("I")
+        self._header_end: int = 0
+        self._spans: typing.List[HarmonyTokenSpan] = []
+        self._has_function_tools: bool = False
+
+    def render(self, messages: typing.List[MessageTypes]) -> HarmonyTokens:
+        header_key = self._get_header_key(messages)
+        if header_key != self._header_key or not self._is_prefix(messages):
+            self._render_full(messages, header_key)
+        elif len(messages) > len(self._snapshots):
+            self._render_tail(messages)
+
+        return HarmonyTokens(
+            array.array("I", self._tokens), self._header_end, list(self._spans)
+        )
+
+    def render_str(self, messages: typing.List[MessageTypes]) -> str:
+        return harmony_tokens_to_str(self.render(messages).tokens)
+
+    def reset(self) -> None:
+        self._header_key = None
+        self._snapshots.clear()
+
+    def _get_header_key(
+        self, messages: typing.List[MessageTypes]
+    ) -> typing.Tuple[typing.Any, ...]:
+        header: typing.List[typing.Any] = [
+            self.reasoning_effort,
+            self.conversation_start_date
+            or datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+            [tool.model_dump_json() for tool in self.tools or []],
+        ]
+        for m in messages:
+            if isinstance(m, (SystemMessage, DeveloperMessage)):
+                header.append(m.content)
+            elif isinstance(m, McpListToolsMessage):
+                header.append([tool.model_dump_json() for tool in m.mcp_tools])
+        return tuple(
+            tuple(item) if isinstance(item, typing.List) else item for item in header
+        )
+
+    def _is_prefix(self, messages: typing.List[MessageTypes]) -> bool:
+        from str_message.types.messages_params_cache import message_unchanged
+
+        if len(messages) < len(self._snapshots):
+            return False
+        return all(
+            message_type is type(message) and message_unchanged(snapshot, message)
+            for (message_type, snapshot), message in zip(self._snapshots, messages)
+        )
+
+    def _render_full(
+        self,
+        messages: typing.List[MessageTypes],
+        header_key: typing.Tuple[typing.Any, ...],
+    ) -> None:
+        from str_message.types.messages_params_cache import message_snapshot
+
+        harmony_conversation, sources = _harmony_conversation(
+            messages,
+            reasoning_effort=self.reasoning_effort,
+            conversation_start_date=header_key[1],
+            tools=self.tools,
+        )
+        encoding = get_harmony_encoding()
+        tokens = array.array("I", encoding.render_conversation(harmony_conversation))
+        bounds = _harmony_message_bounds(encoding, harmony_conversation, tokens)
+
+        self._spans = [
+            HarmonyTokenSpan(source, *bound)
+            for source, bound in zip(sources, bounds)
+            if source is not None and bound is not None
+        ]
+        self._tokens = tokens
+        self._header_end = self._spans[0].start if self._spans else len(tokens)
+        self._header_key = header_key
+        self._snapshots = [(type(m), message_snapshot(m)) for m in messages]
+        self._has_function_tools = _has_function_tools(harmony_conversation)
+        self.full_renders += 1
+
+    def _render_tail(self, messages: typing.List[MessageTypes]) -> None:
+        from str_message.types.messages_params_cache import message_snapshot
+
+        tail = [
+            (idx, harmony_message)
+            for idx in range(len(self._snapshots), len(messages))
+            if (harmony_message := _harmony_message(messages[idx])) is not None
+        ]
+        # Assistant messages are rendered without the final channel, so an
+        # appended message never drops earlier analysis messages
+        encoding = get_harmony_encoding()
+        options = RenderOptions(
+            conversation_has_function_tools=self._has_function_tools
+        )
+        for idx, harmony_message in tail:
+            message_tokens = encoding.render(harmony_message, options)
+            if message_tokens:
+                start = len(self._tokens)
+                self._tokens.extend(message_tokens)
+                self._spans.append(HarmonyTokenSpan(idx, start, len(self._tokens)))
+
+        self._snapshots.extend(
+            (type(m), message_snapshot(m)) for m in messages[len(self._snapshots) :]
+        )
+        self.incremental_renders += 1
@@ -54,6 +54,7 @@ from str_message import (
     ToolCallOutputMessage,
     UserMessage,
 )
+from str_message.utils.resolve_blob_url import resolve_blob_url
 
 logger = logging.getLogger(__name__)
 
@@ -83,7 +84,8 @@ def messages_gen_response_input_param(
                             ResponseInputAudioParam(
                                 type="input_audio",
                                 input_audio=InputAudio(
-                                    data=content_part.value, format="wav"
+                                    data=resolve_blob_url(content_part.value),
+                                    format="wav",
                                 ),
                             )  # type: ignore
                         ],
@@ -95,7 +97,7 @@ def messages_gen_response_input_param(
                             ResponseInputImageParam(
                                 detail="auto",
                                 type="input_image",
-                                image_url=content_part.value,
+                                image_url=resolve_blob_url(content_part.value),
                             )
                         ],
                     )
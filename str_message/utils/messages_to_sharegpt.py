@@ -24,6 +24,7 @@ from str_message import (
     ToolCallOutputMessage,
     UserMessage,
 )
+from str_message.utils.resolve_blob_url import resolve_blob_url
 
 if typing.TYPE_CHECKING:
     from str_message import MessageTypes
@@ -74,7 +75,9 @@ def messages_to_sharegpt(
                     )
 
                 elif content.type in (CONTENT_AUDIO_TYPE,):
-                    audio_data_url = durl.DataURL.from_url(content.value)
+                    audio_data_url = durl.DataURL.from_url(
+                        resolve_blob_url(content.value)
+                    )
                     audio_bytes = audio_data_url.data_decoded_bytes
                     audio_filename = (
                         f"{hashlib.md5(audio_bytes).hexdigest()}"
@@ -86,7 +89,9 @@ def messages_to_sharegpt(
                     output_audios.append(str(audio_filepath))
 
                 elif content.type in (CONTENT_IMAGE_URL_TYPE,):
-                    image_data_url = durl.DataURL.from_url(content.value)
+                    image_data_url = durl.DataURL.from_url(
+                        resolve_blob_url(content.value)
+                    )
                     if image_data_url.data.startswith("http"):
                         response = requests.get(image_data_url.data)
                         response.raise_for_status()
@@ -0,0 +1,16 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_blob_url(url: str) -> str:
+    """Return the payload a blob URL references, other URLs are returned as is."""
+    from str_message.types.blob_store import get_blob_store, is_blob_url
+
+    if not is_blob_url(url):
+        return url
+
+    blob_store = get_blob_store()
+    if blob_store is None:
+        raise ValueError(f"No blob store is set to resolve: {url}")
+    return blob_store.get(url)
@@ -84,3 +84,18 @@ def sample_image() -> pathlib.Path:
     response.raise_for_status()
     sample_image_path.write_bytes(response.content)
     return sample_image_path
+
+
+@pytest.fixture
+def harmony_encoding(monkeypatch):
+    """The real gpt-oss Harmony encoding, skips when its vocab can not load."""
+    from openai_harmony import HarmonyEncodingName, load_harmony_encoding
+
+    from str_message.utils import messages_to_harmony as harmony_module
+
+    try:
+        encoding = load_harmony_encoding(HarmonyEncodingName.HARMONY_GPT_OSS)
+    except Exception as e:
+        pytest.skip(f"Harmony encoding not available: {e}")
+    monkeypatch.setattr(harmony_module, "_harmony_encoding", encoding)
+    return encoding
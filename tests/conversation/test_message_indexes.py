@@ -0,0 +1,79 @@
+from str_message import (
+    AssistantMessage,
+    Conversation,
+    McpCallMessage,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+    UserMessage,
+)
+
+
+def _tool_call(call_id: str) -> ToolCallMessage:
+    return ToolCallMessage(
+        tool_call_id=call_id, tool_name="get_weather", tool_call_arguments="{}"
+    )
+
+
+def _tool_call_output(call_id: str) -> ToolCallOutputMessage:
+    return ToolCallOutputMessage(
+        tool_call_id=call_id, tool_name="get_weather", content="Sunny"
+    )
+
+
+def test_indexes_follow_add_message():
+    user = UserMessage(content="Weather in Tokyo and Osaka?")
+    conv = Conversation(messages=[user])
+    assert conv.pending_tool_calls() == []
+
+    conv.add_message([_tool_call("call_1"), _tool_call("call_2")])
+    assert [m.tool_call_id for m in conv.pending_tool_calls()] == [
+        "call_1",
+        "call_2",
+    ]
+    assert conv.output_for("call_1") is None
+
+    output = _tool_call_output("call_2")
+    conv.add_message(output)
+    assert conv.output_for("call_2") is output
+    assert [m.tool_call_id for m in conv.pending_tool_calls()] == ["call_1"]
+    assert conv.tool_call_for("call_2") is conv.messages[2]
+    assert conv.get_message(user.id) is user
+
+    mcp_call = McpCallMessage(
+        mcp_call_id="mcp_1",
+        mcp_call_server_label="aws",
+        mcp_call_name="search",
+        content="S3 is object storage.",
+    )
+    conv.messages.append(mcp_call)  # Not through add_message
+    assert conv.mcp_call_for("mcp_1") is mcp_call
+
+
+def test_indexes_rebuilt_after_in_place_changes():
+    conv = Conversation()
+    conv.add_message([_tool_call("call_1"), _tool_call_output("call_1")])
+    assert conv.pending_tool_calls() == []
+
+    conv.messages.pop()
+    assert [m.tool_call_id for m in conv.pending_tool_calls()] == ["call_1"]
+
+    conv.messages = [UserMessage(content="Hi"), AssistantMessage(content="Hello.")]
+    conv.add_message(_tool_call("call_3"))
+    assert conv.tool_call_for("call_1") is None
+    assert [m.tool_call_id for m in conv.pending_tool_calls()] == ["call_3"]
+    assert conv.get_message(conv.messages[0].id) is conv.messages[0]
+
+
+def test_indexes_reindex_after_replace_in_place():
+    conv = Conversation()
+    conv.add_message([_tool_call("call_1"), AssistantMessage(content="Checking.")])
+    assert [m.tool_call_id for m in conv.pending_tool_calls()] == ["call_1"]
+
+    # Same length and last message, only seen after `reindex`
+    conv.messages[0] = _tool_call("call_2")
+    conv.reindex()
+    assert conv.tool_call_for("call_1") is None
+    assert [m.tool_call_id for m in conv.pending_tool_calls()] == ["call_2"]
+
+    conv.messages[-1] = _tool_call_output("call_2")
+    assert conv.pending_tool_calls() == []
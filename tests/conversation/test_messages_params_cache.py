@@ -0,0 +1,160 @@
+import json
+import pickle
+import typing
+
+import pytest
+
+from str_message import (
+    AssistantMessage,
+    Conversation,
+    Message,
+    ReasoningMessage,
+    SystemMessage,
+    ToolCallMessage,
+    UserMessage,
+)
+
+PARAMS_PROPERTIES = {
+    "chat_cmpl_messages": Message.to_chat_cmpl_input_messages,
+    "response_input_param": Message.to_response_input_param,
+}
+
+
+@pytest.fixture(params=list(PARAMS_PROPERTIES))
+def params_property(request) -> str:
+    return request.param
+
+
+def _reasoning_message(text: str) -> ReasoningMessage:
+    return ReasoningMessage(
+        content=json.dumps(
+            {"summary": [{"type": "summary_text", "text": text}], "content": []}
+        )
+    )
+
+
+def _conversation() -> Conversation:
+    return Conversation(
+        messages=[
+            SystemMessage(content="You are a helpful assistant."),
+            UserMessage(content="What is the weather in Tokyo?"),
+            _reasoning_message("Need the weather tool."),
+            ToolCallMessage(
+                tool_call_id="call_1",
+                tool_name="get_weather",
+                tool_call_arguments='{"city": "Tokyo"}',
+            ),
+        ]
+    )
+
+
+def _params(conv: Conversation, params_property: str) -> typing.List[typing.Any]:
+    return getattr(conv, params_property)
+
+
+def _expected(conv: Conversation, params_property: str) -> typing.List[typing.Any]:
+    return PARAMS_PROPERTIES[params_property](conv.messages)
+
+
+def _params_cache(conv: Conversation, key: str):
+    return conv.__dict__["_messages_params_caches"][key]
+
+
+def _mutate(value: typing.Any) -> None:
+    # Edits every dict and list of the params in place
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if isinstance(item, (dict, list)):
+                _mutate(item)
+            else:
+                value[key] = "MUTATED"
+    elif isinstance(value, list):
+        for item in value:
+            _mutate(item)
+        value.append("MUTATED")
+
+
+def test_params_append_converts_tail(params_property):
+    conv = _conversation()
+    assert _params(conv, params_property) == _expected(conv, params_property)
+    cache = _params_cache(conv, params_property)
+    assert cache.misses == 4
+
+    conv.add_message(AssistantMessage(content="It is sunny."))
+    conv.add_message(UserMessage(content="Thanks!"))
+    assert _params(conv, params_property) == _expected(conv, params_property)
+    assert (cache.hits, cache.misses) == (4, 6)
+
+
+def test_params_invalidated_on_edit(params_property):
+    conv = _conversation()
+    _params(conv, params_property)
+
+    conv.messages[1].content = "What is the weather in Osaka?"
+    conv.messages[3].metadata = {"source": "test"}
+    assert _params(conv, params_property) == _expected(conv, params_property)
+
+    conv.messages[3].metadata["source"] = "edited"  # type: ignore
+    conv.messages[0] = SystemMessage(content="Be brief.")
+    assert _params(conv, params_property) == _expected(conv, params_property)
+    assert _params_cache(conv, params_property).misses == 8
+
+    conv.messages = conv.messages[:1]
+    assert _params(conv, params_property) == _expected(conv, params_property)
+    assert len(_params_cache(conv, params_property)) == 1
+
+
+def test_params_mutation_does_not_leak(params_property):
+    conv = _conversation()
+    expected = _expected(conv, params_property)
+
+    _mutate(_params(conv, params_property))
+    assert _params(conv, params_property) == expected
+
+
+def test_params_cache_not_in_model(params_property):
+    conv = _conversation()
+    other = conv.model_copy(deep=True)
+    _params(conv, params_property)
+
+    assert conv == other
+    assert set(conv.model_dump()) == {"id", "messages", "usages"}
+
+
+def test_params_pickle_after_conversion(params_property):
+    conv = _conversation()
+    expected = _params(conv, params_property)
+    conv.get_message(conv.messages[0].id)
+
+    restored = pickle.loads(pickle.dumps(conv))
+
+    assert restored == conv
+    assert "_messages_params_caches" not in restored.__dict__
+    assert _params(restored, params_property) == expected
+    assert restored.get_message(conv.messages[0].id) == conv.messages[0]
+
+
+def test_response_input_param_ignore_reasoning():
+    conv = _conversation()
+    conv.response_input_param
+
+    items = conv.to_response_input_param(ignore_reasoning=True)
+    assert "reasoning" not in [item.get("type") for item in items]
+    assert items == Message.to_response_input_param(
+        conv.messages, ignore_reasoning=True
+    )
+    assert len(conv.response_input_param) == len(items) + 1
+
+
+def test_response_input_param_reasoning_edited():
+    conv = _conversation()
+    conv.response_input_param
+
+    conv.messages[2].content = json.dumps(
+        {"summary": [{"type": "summary_text", "text": "Edited."}], "content": []}
+    )
+    (reasoning,) = [
+        item for item in conv.response_input_param if item.get("type") == "reasoning"
+    ]
+    assert reasoning["summary"][0]["text"] == "Edited."  # type: ignore
+    assert _params_cache(conv, "response_input_param").misses == 5
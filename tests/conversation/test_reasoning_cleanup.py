@@ -0,0 +1,77 @@
+from str_message import (
+    AssistantMessage,
+    Conversation,
+    Message,
+    ReasoningMessage,
+    ToolCallMessage,
+    UserMessage,
+)
+from str_message.utils.ensure_reasoning_following_items import (
+    ensure_reasoning_following_items,
+)
+
+
+def _tool_call() -> ToolCallMessage:
+    return ToolCallMessage(
+        tool_call_id="call_1", tool_name="get_weather", tool_call_arguments="{}"
+    )
+
+
+def test_removes_reasoning_without_following_item_in_place():
+    messages = [
+        UserMessage(content="Hi"),
+        ReasoningMessage(content="a"),
+        _tool_call(),
+        ReasoningMessage(content="b"),
+        AssistantMessage(content="Hello."),
+        ReasoningMessage(content="c"),
+    ]
+    removed_ids = [messages[1].id, messages[5].id]
+    same_list = messages
+
+    report = ensure_reasoning_following_items(messages)
+
+    assert messages is same_list
+    assert [m.id for m in report.removed] == removed_ids
+    assert report.indexes == [1, 5]
+    assert [type(m) for m in messages] == [
+        UserMessage,
+        ToolCallMessage,
+        ReasoningMessage,
+        AssistantMessage,
+    ]
+    assert not ensure_reasoning_following_items(messages)
+
+
+def test_trailing_reasoning_removed_by_classmethod():
+    messages = [UserMessage(content="Hi"), ReasoningMessage(content="a")]
+    assert Message.ensure_reasoning_following_items(messages) == messages[:1]
+    assert len(messages) == 1
+
+
+def test_add_message_ensure_reasoning_incrementally():
+    conv = Conversation(messages=[UserMessage(content="Hi")])
+
+    # The following item of a trailing reasoning may still come
+    conv.add_message(ReasoningMessage(content="a"), ensure_reasoning=True)
+    conv.add_message(AssistantMessage(content="Hello."), ensure_reasoning=True)
+    assert len(conv.messages) == 3
+
+    conv.add_message(
+        [ReasoningMessage(content="b"), UserMessage(content="Bye")],
+        ensure_reasoning=True,
+    )
+    conv.add_message(ReasoningMessage(content="c"), ensure_reasoning=True)
+    conv.add_message(_tool_call(), ensure_reasoning=True)
+    assert [type(m) for m in conv.messages] == [
+        UserMessage,
+        ReasoningMessage,
+        AssistantMessage,
+        UserMessage,
+        ToolCallMessage,
+    ]
+
+    conv.add_message(ReasoningMessage(content="d"))
+    report = conv.clean_messages()
+    assert report.indexes == [5]
+    assert len(conv.messages) == 5
@@ -0,0 +1,168 @@
+import durl
+import pytest
+
+from str_message import (
+    AssistantMessage,
+    Conversation,
+    MessageTypes,
+    ReasoningMessage,
+    SystemMessage,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+    UserMessage,
+)
+from str_message.utils.message_token_count import (
+    CONTENT_PART_TOKENS,
+    MESSAGE_OVERHEAD_TOKENS,
+)
+
+
+class WordEncoding:
+    """One token per word, stands in for a tiktoken encoding."""
+
+    name = "words"
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text: str, disallowed_special=()) -> list[int]:
+        self.calls += 1
+        return [0] * len(text.split())
+
+
+def _turn(idx: int) -> list[MessageTypes]:
+    return [
+        UserMessage(content=f"question {idx}"),
+        ReasoningMessage(content="thinking"),
+        AssistantMessage(content=f"answer number {idx}"),
+    ]
+
+
+def _conversation(turns: int) -> Conversation:
+    conv = Conversation(messages=[SystemMessage(content="Be brief.")])
+    for idx in range(turns):
+        conv.add_message(_turn(idx))
+    return conv
+
+
+def test_token_counts_cached_per_message():
+    encoding = WordEncoding()
+    conv = Conversation(
+        messages=[
+            UserMessage(content="what is this image").add_image(
+                b"\xff\xd8\xff", durl.MIMEType.JPEG_IMAGES
+            )
+        ]
+    )
+
+    assert conv.token_counts(encoding=encoding) == [
+        MESSAGE_OVERHEAD_TOKENS + 4 + CONTENT_PART_TOKENS
+    ]
+    conv.add_message(AssistantMessage(content="a jpeg"))
+    assert conv.token_counts(encoding=encoding)[1] == MESSAGE_OVERHEAD_TOKENS + 2
+    assert encoding.calls == 2
+
+    conv.messages[1].content = "an empty jpeg"
+    assert conv.token_counts(encoding=encoding)[1] == MESSAGE_OVERHEAD_TOKENS + 3
+    assert encoding.calls == 3
+
+
+def test_fit_to_budget_drops_oldest_turns():
+    encoding = WordEncoding()
+    conv = _conversation(4)
+    turn_tokens = sum(conv.token_counts(encoding=encoding)[1:4])
+    budget = sum(conv.token_counts(encoding=encoding)) - turn_tokens
+
+    removed = conv.fit_to_budget(budget, encoding=encoding)
+
+    assert [m.content for m in removed if isinstance(m, UserMessage)] == ["question 0"]
+    assert isinstance(conv.messages[0], SystemMessage)
+    assert conv.messages[1].content == "question 1"
+    assert sum(conv.token_counts(encoding=encoding)) <= budget
+    assert conv.fit_to_budget(budget, encoding=encoding) == []
+
+    # The latest turn is always kept
+    conv.fit_to_budget(1, encoding=encoding)
+    assert [m.content for m in conv.messages[:2]] == ["Be brief.", "question 3"]
+
+
+def test_fit_to_budget_keeps_tool_call_pairs():
+    encoding = WordEncoding()
+    conv = Conversation(
+        messages=[
+            UserMessage(content="weather in Tokyo"),
+            ToolCallMessage(
+                tool_call_id="call_1",
+                tool_name="get_weather",
+                tool_call_arguments='{"city": "Tokyo"}',
+            ),
+            UserMessage(content="hurry up"),
+            ToolCallOutputMessage(
+                tool_call_id="call_1", tool_name="get_weather", content="sunny"
+            ),
+            AssistantMessage(content="It is sunny."),
+            UserMessage(content="thanks"),
+        ]
+    )
+
+    removed = conv.fit_to_budget(MESSAGE_OVERHEAD_TOKENS + 1, encoding=encoding)
+
+    assert len(removed) == 5
+    assert [m.content for m in conv.messages] == ["thanks"]
+
+
+def test_fit_to_budget_summarize():
+    encoding = WordEncoding()
+    conv = _conversation(4)
+    budget = sum(conv.token_counts(encoding=encoding)) - 10
+    summarized: list[list[MessageTypes]] = []
+
+    def summarize(messages: list[MessageTypes]) -> str:
+        summarized.append(messages)
+        return "Summary of earlier turns."
+
+    removed = conv.fit_to_budget(
+        budget, strategy="summarize", summarize=summarize, encoding=encoding
+    )
+
+    # Dropping one turn leaves no room for the summary, so two are dropped
+    assert len(removed) == 6
+    assert [len(messages) for messages in summarized] == [3, 6]
+    assert [m.content for m in conv.messages[:3]] == [
+        "Be brief.",
+        "Summary of earlier turns.",
+        "question 2",
+    ]
+    assert sum(conv.token_counts(encoding=encoding)) <= budget
+
+
+def test_fit_to_budget_summarize_requires_summarize():
+    with pytest.raises(ValueError):
+        _conversation(2).fit_to_budget(1, strategy="summarize", encoding=WordEncoding())
+
+
+def test_fit_to_budget_summarize_replaces_previous_summary():
+    encoding = WordEncoding()
+    conv = _conversation(2)
+    budget = sum(conv.token_counts(encoding=encoding))
+    summarized: list[list[MessageTypes]] = []
+
+    def summarize(messages: list[MessageTypes]) -> str:
+        summarized.append(messages)
+        return f"Summary {len(summarized)}."
+
+    for idx in range(2, 8):
+        previous = conv.messages[1]
+        summarized.clear()
+        conv.add_message(_turn(idx))
+        conv.fit_to_budget(
+            budget, strategy="summarize", summarize=summarize, encoding=encoding
+        )
+
+        assert sum(conv.token_counts(encoding=encoding)) <= budget
+        summaries = [m for m in conv.messages if (m.metadata or {}).get("is_summary")]
+        assert summaries == [conv.messages[1]]
+        assert isinstance(conv.messages[1], UserMessage)
+        # The previous summary is summarized again, not kept
+        if idx > 2:
+            assert all(messages[0] is previous for messages in summarized)
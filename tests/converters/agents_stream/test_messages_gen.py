@@ -0,0 +1,84 @@
+import asyncio
+
+import agents
+from openai.types.responses.response_function_tool_call import ResponseFunctionToolCall
+from openai.types.responses.response_output_message import ResponseOutputMessage
+from openai.types.responses.response_output_text import ResponseOutputText
+
+from str_message import (
+    AssistantMessage,
+    Conversation,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+    UserMessage,
+)
+from str_message.utils.messages_gen_from_agents_stream import (
+    messages_gen_from_agents_stream,
+)
+
+AGENT = agents.Agent(name="test_agent")
+
+
+def _events():
+    tool_call = ResponseFunctionToolCall(
+        call_id="call_1",
+        name="get_weather",
+        arguments='{"city": "Tokyo"}',
+        type="function_call",
+    )
+    output = {"type": "function_call_output", "call_id": "call_1", "output": "Sunny"}
+    message = ResponseOutputMessage(
+        id="msg_1",
+        type="message",
+        role="assistant",
+        status="completed",
+        content=[ResponseOutputText(type="output_text", text="Sunny", annotations=[])],
+    )
+    return [
+        agents.AgentUpdatedStreamEvent(new_agent=AGENT),
+        agents.RunItemStreamEvent(
+            name="tool_called", item=agents.ToolCallItem(AGENT, tool_call)
+        ),
+        agents.RunItemStreamEvent(
+            name="tool_output",
+            item=agents.ToolCallOutputItem(AGENT, output, output="Sunny"),
+        ),
+        agents.RunItemStreamEvent(
+            name="message_output_created",
+            item=agents.MessageOutputItem(AGENT, message),
+        ),
+    ]
+
+
+def test_yields_and_appends_messages_live(monkeypatch):
+    def to_input_item(self):
+        raise AssertionError("Raw items are converted without a dict round trip")
+
+    monkeypatch.setattr(agents.items.RunItemBase, "to_input_item", to_input_item)
+    monkeypatch.setattr(agents.ToolCallOutputItem, "to_input_item", to_input_item)
+    conv = Conversation(messages=[UserMessage(content="Weather in Tokyo?")])
+    seen: list[int] = []
+
+    async def events():
+        for event in _events():
+            yield event
+
+    async def run():
+        output = []
+        async for message in messages_gen_from_agents_stream(
+            events(), conversation=conv
+        ):
+            seen.append(len(conv.messages))  # Added before it is yielded
+            output.append(message)
+        return output
+
+    messages = asyncio.run(run())
+    assert [type(m) for m in messages] == [
+        ToolCallMessage,
+        ToolCallOutputMessage,
+        AssistantMessage,
+    ]
+    assert seen == [2, 3, 4]
+    assert conv.messages[1:] == messages
+    assert messages[1].tool_name == "get_weather"
+    assert messages[2].id == "msg_1"
@@ -0,0 +1,81 @@
+import durl
+import pytest
+
+from str_message import CONTENT_IMAGE_URL_TYPE, Conversation, UserMessage
+from str_message.types.blob_store import (
+    BLOB_URL_PREFIX,
+    LocalBlobStore,
+    MemoryBlobStore,
+    set_blob_store,
+)
+
+IMAGE_BYTES = b"\xff\xd8\xff" + bytes(range(256)) * 64
+
+
+@pytest.fixture
+def memory_blob_store():
+    blob_store = MemoryBlobStore()
+    previous = set_blob_store(blob_store)
+    yield blob_store
+    set_blob_store(previous)
+
+
+def _image_data_url() -> str:
+    return str(durl.DataURL.from_data(durl.MIMEType.JPEG_IMAGES, IMAGE_BYTES))
+
+
+def test_blob_store_content_addressed(tmp_path):
+    for blob_store in (MemoryBlobStore(), LocalBlobStore(tmp_path)):
+        url = blob_store.put(_image_data_url())
+        assert url.startswith(BLOB_URL_PREFIX)
+        assert blob_store.put(_image_data_url()) == url
+        assert blob_store.get(url) == _image_data_url()
+        assert url in blob_store
+        assert BLOB_URL_PREFIX + "0" * 64 not in blob_store
+        with pytest.raises(KeyError):
+            blob_store.get(BLOB_URL_PREFIX + "0" * 64)
+        with pytest.raises(ValueError):
+            blob_store.get(BLOB_URL_PREFIX + "../../etc/passwd")
+
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_add_image_references_blob(memory_blob_store):
+    message = UserMessage(content="What is this image?").add_image(
+        IMAGE_BYTES, durl.MIMEType.JPEG_IMAGES
+    )
+
+    assert _image_data_url() not in message.content
+    image_part = message.content_parts[-1]
+    assert image_part.type == CONTENT_IMAGE_URL_TYPE
+    assert memory_blob_store.get(image_part.value) == _image_data_url()
+
+
+def test_serializers_resolve_blob(memory_blob_store):
+    conv = Conversation(
+        messages=[
+            UserMessage(content="What is this image?").add_image(
+                IMAGE_BYTES, durl.MIMEType.JPEG_IMAGES
+            )
+        ]
+    )
+
+    chat_cmpl_messages = conv.chat_cmpl_messages
+    assert chat_cmpl_messages[-1]["content"][0]["image_url"]["url"] == (  # type: ignore  # noqa: E501
+        _image_data_url()
+    )
+
+    response_input_param = conv.response_input_param
+    assert response_input_param[-1]["content"][0]["image_url"] == (  # type: ignore
+        _image_data_url()
+    )
+
+
+def test_unresolvable_blob_raises(memory_blob_store):
+    message = UserMessage(content="What is this image?").add_image(
+        IMAGE_BYTES, durl.MIMEType.JPEG_IMAGES
+    )
+    set_blob_store(None)
+
+    with pytest.raises(ValueError):
+        Conversation(messages=[message]).chat_cmpl_messages
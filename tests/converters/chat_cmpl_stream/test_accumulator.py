@@ -0,0 +1,168 @@
+import typing
+
+from openai.types.chat.chat_completion import ChatCompletion
+from openai.types.chat.chat_completion_chunk import ChatCompletionChunk
+
+from str_message import (
+    AssistantMessage,
+    Message,
+    ReasoningMessage,
+    ToolCallMessage,
+)
+from str_message.types.chat_cmpl_stream_accumulator import ChatCmplStreamAccumulator
+from str_message.types.tool_call_registry import (
+    TTLToolCallRegistry,
+    use_tool_call_registry,
+)
+
+
+def _chunk(
+    delta: typing.Dict[str, typing.Any],
+    *,
+    index: int = 0,
+    finish_reason: str | None = None,
+) -> ChatCompletionChunk:
+    # Not validated, like the chunks the OpenAI SDK parses from a stream
+    return ChatCompletionChunk.construct(
+        id="chatcmpl-1",
+        object="chat.completion.chunk",
+        created=0,
+        model="gpt-5-nano",
+        choices=[{"index": index, "delta": delta, "finish_reason": finish_reason}],
+    )
+
+
+def _tool_call_delta(
+    index: int | None, id: str | None = None, name: str = "", arguments: str = ""
+) -> typing.Dict[str, typing.Any]:
+    return {
+        "tool_calls": [
+            {
+                "index": index,
+                "id": id,
+                "type": "function" if id else None,
+                "function": {"name": name, "arguments": arguments},
+            }
+        ]
+    }
+
+
+def test_accumulates_content_and_reasoning():
+    acc = ChatCmplStreamAccumulator()
+    assert acc.add(_chunk({"role": "assistant", "reasoning": "Think"})) == []
+    assert acc.add(_chunk({"reasoning": "ing", "content": "Hello"})) == []
+
+    (partial,) = [m for m in acc.partial_messages() if m.channel == "final"]
+    assert partial.content == "Hello"
+
+    messages = acc.add(_chunk({"content": ", world"}, finish_reason="stop"))
+    assert [type(m) for m in messages] == [ReasoningMessage, AssistantMessage]
+    assert messages[0].content == "Thinking"
+    assert messages[1].content == "Hello, world"
+    assert messages[1].id == "chatcmpl-1"
+    assert acc.finish() == []
+
+
+def test_accumulates_tool_calls_by_index():
+    acc = ChatCmplStreamAccumulator()
+    registry = TTLToolCallRegistry()
+    with use_tool_call_registry(registry):
+        acc.add(_chunk(_tool_call_delta(0, "call_1", "get_weather", '{"ci')))
+        acc.add(_chunk(_tool_call_delta(1, "call_2", "get_time", "{}")))
+        acc.add(_chunk(_tool_call_delta(0, arguments='ty": "Tokyo"}')))
+        messages = acc.add(_chunk({}, finish_reason="tool_calls"))
+
+    assert all(isinstance(m, ToolCallMessage) for m in messages)
+    assert [(m.tool_call_id, m.tool_call_arguments) for m in messages] == [
+        ("call_1", '{"city": "Tokyo"}'),
+        ("call_2", "{}"),
+    ]
+    assert [m.id for m in messages] == ["call_1", "call_2"]
+    assert registry.get("call_1").name == "get_weather"
+
+
+def test_gemini_tool_calls_without_index():
+    acc = ChatCmplStreamAccumulator()
+    acc.add(_chunk(_tool_call_delta(None, "call_1", "get_weather", '{"city": ')))
+    acc.add(_chunk(_tool_call_delta(None, arguments='"Tokyo"}')))
+    acc.add(_chunk(_tool_call_delta(None, "call_2", "get_time", "{}")))
+    messages = acc.finish()
+
+    assert [(m.tool_call_id, m.tool_call_arguments) for m in messages] == [
+        ("call_1", '{"city": "Tokyo"}'),
+        ("call_2", "{}"),
+    ]
+
+
+def test_emits_each_choice_as_it_finishes():
+    acc = ChatCmplStreamAccumulator()
+    acc.add(_chunk({"content": "A"}, index=0))
+    acc.add(_chunk({"content": "B"}, index=1))
+    (first,) = acc.add(_chunk({}, index=1, finish_reason="stop"))
+    assert first.content == "B"
+    (second,) = acc.finish()
+    assert second.content == "A"
+
+
+def test_matches_final_completion():
+    acc = ChatCmplStreamAccumulator()
+    for delta in ({"content": "Hi"}, {"content": " there"}):
+        acc.add(_chunk(delta))
+    (streamed,) = acc.add(_chunk({}, finish_reason="stop"))
+
+    (converted,) = Message.from_any(
+        {"role": "assistant", "content": "Hi there", "id": streamed.id}
+    )
+    assert streamed.content == converted.content
+    assert type(streamed) is type(converted)
+
+
+def test_gemini_tool_calls_with_patched_index():
+    acc = ChatCmplStreamAccumulator()
+    acc.add(_chunk(_tool_call_delta(0, "call_1", "get_weather", '{"city": ')))
+    acc.add(_chunk(_tool_call_delta(0, arguments='"Tokyo"}')))
+    acc.add(_chunk(_tool_call_delta(0, "call_2", "get_time", "{}")))
+    messages = acc.add(_chunk({}, finish_reason="tool_calls"))
+
+    assert [m.tool_call_id for m in messages] == ["call_1", "call_2"]
+    assert messages[0].tool_call_arguments == '{"city": "Tokyo"}'
+
+
+def test_tool_call_ids_do_not_collide_with_content():
+    acc = ChatCmplStreamAccumulator()
+    acc.add(_chunk({"content": "Checking the weather."}))
+    acc.add(_chunk(_tool_call_delta(0, "call_1", "get_weather", "{}")))
+    messages = acc.add(_chunk({}, finish_reason="tool_calls"))
+
+    assert [type(m) for m in messages] == [AssistantMessage, ToolCallMessage]
+    assert [m.id for m in messages] == ["chatcmpl-1", "call_1"]
+
+
+def test_streamed_ids_match_non_streamed():
+    tool_call = {
+        "id": "call_1",
+        "type": "function",
+        "function": {"name": "get_weather", "arguments": "{}"},
+    }
+    for message, deltas in (
+        ({"role": "assistant", "content": "Hello"}, [{"content": "Hello"}]),
+        (
+            {"role": "assistant", "content": None, "tool_calls": [tool_call]},
+            [_tool_call_delta(0, "call_1", "get_weather", "{}")],
+        ),
+    ):
+        completion = ChatCompletion.model_validate(
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-5-nano",
+                "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+            }
+        )
+        acc = ChatCmplStreamAccumulator()
+        for delta in deltas:
+            acc.add(_chunk(delta))
+        streamed = acc.add(_chunk({}, finish_reason="stop"))
+
+        assert [m.id for m in streamed] == [m.id for m in Message.from_any(completion)]
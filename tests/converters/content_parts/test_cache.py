@@ -0,0 +1,34 @@
+import durl
+
+from str_message import CONTENT_IMAGE_URL_TYPE, CONTENT_TEXT_TYPE, UserMessage
+
+
+def test_content_parts_cached():
+    message = UserMessage(content="What is this image?")
+
+    parts = message.content_parts
+    assert message.content_parts == parts
+    assert message.content_parts[0] is parts[0]  # Parsed only once
+
+
+def test_content_parts_invalidated_on_change():
+    message = UserMessage(content="What is this image?")
+    assert [p.type for p in message.content_parts] == [CONTENT_TEXT_TYPE]
+
+    message.add_image(b"\xff\xd8\xff", durl.MIMEType.JPEG_IMAGES)
+    assert [p.type for p in message.content_parts] == [
+        CONTENT_TEXT_TYPE,
+        CONTENT_IMAGE_URL_TYPE,
+    ]
+
+    message.content = "Never mind."
+    assert [p.value for p in message.content_parts] == ["Never mind."]
+
+
+def test_content_parts_cache_not_in_model():
+    message = UserMessage(content="hi")
+    other = message.model_copy(deep=True)
+    message.content_parts
+
+    assert message == other
+    assert "_content_parts_cache" not in message.model_dump()
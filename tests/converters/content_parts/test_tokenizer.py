@@ -0,0 +1,46 @@
+import pytest
+
+from str_message import ContentPart
+from str_message.utils.content_parts_from_str import (
+    content_part_spans_from_str,
+    content_parts_from_str,
+)
+
+
+@pytest.mark.parametrize(
+    "content, expected",
+    [
+        ("", []),
+        ("  hi  ", [("text", "hi")]),
+        (
+            " What is this? @![image_url](data:image/jpeg;base64,AAAA) \n\n Thanks ",
+            [
+                ("text", "What is this?"),
+                ("image_url", "data:image/jpeg;base64,AAAA"),
+                ("text", "Thanks"),
+            ],
+        ),
+        (
+            "a@![file_id](f)@![image_id](i)b",
+            [("text", "a"), ("file_id", "f"), ("image_id", "i"), ("text", "b")],
+        ),
+        ("@![]() @![x]() @![x] (y)", [("text", "@![]() @![x]() @![x] (y)")]),
+        ("@![@![image_url](u)", [("@![image_url", "u")]),
+        ("@![image_url](no closing", [("text", "@![image_url](no closing")]),
+    ],
+)
+def test_tokenizer(content: str, expected: list[tuple[str, str]]):
+    assert [(p.type, p.value) for p in content_parts_from_str(content)] == expected
+    assert [
+        (span.type, content[span.start : span.end])
+        for span in content_part_spans_from_str(content)
+    ] == expected
+
+
+def test_tokenizer_parts_are_models():
+    (part,) = content_parts_from_str("@![image_url](https://example.com/a.png)")
+    assert part == ContentPart(type="image_url", value="https://example.com/a.png")
+    assert part.model_dump() == {
+        "type": "image_url",
+        "value": "https://example.com/a.png",
+    }
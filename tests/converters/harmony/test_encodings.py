@@ -0,0 +1,53 @@
+import threading
+
+import pytest
+
+from str_message import AssistantMessage, UserMessage
+from str_message.utils import messages_to_harmony as harmony_module
+
+
+@pytest.fixture
+def fake_encodings(monkeypatch):
+    loads: list[str] = []
+
+    def encoding_for_model(model: str):
+        loads.append(model)
+        return object()
+
+    def load_harmony_encoding(name):
+        loads.append(str(name))
+        return object()
+
+    monkeypatch.setattr(harmony_module, "_tiktoken_encoding", None)
+    monkeypatch.setattr(harmony_module, "_harmony_encoding", None)
+    monkeypatch.setattr(
+        harmony_module.tiktoken, "encoding_for_model", encoding_for_model
+    )
+    monkeypatch.setattr(harmony_module, "load_harmony_encoding", load_harmony_encoding)
+    return loads
+
+
+def test_harmony_dict_does_not_load_encodings(fake_encodings):
+    harmony_module.messages_to_harmony(
+        [UserMessage(content="hi"), AssistantMessage(content="hello")],
+        conversation_start_date="2025-01-01",
+    )
+    assert fake_encodings == []
+
+
+def test_encodings_loaded_once_and_shared(fake_encodings):
+    threads = [
+        threading.Thread(
+            target=harmony_module.warm_up_harmony_encodings,
+            kwargs={"tiktoken_encoding": True},
+        )
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert fake_encodings == ["HarmonyGptOss", "gpt-oss-120b"]
+    assert harmony_module.harmony_encoding is harmony_module.get_harmony_encoding()
+    assert harmony_module.tiktoken_encoding is harmony_module.get_tiktoken_encoding()
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from openai_harmony import Conversation
+
+from str_message import (
+    AssistantMessage,
+    ReasoningMessage,
+    SystemMessage,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+    UserMessage,
+)
+from str_message.utils import messages_to_harmony as harmony_module
+
+MESSAGES = [
+    SystemMessage(content="You are a taciturn assistant."),
+    UserMessage(content="What is the weather in Tokyo?"),
+    ReasoningMessage(content="Need the weather tool."),
+    ToolCallMessage(
+        tool_call_id="call_1",
+        tool_name="get_weather",
+        tool_call_arguments='{"city": "Tokyo"}',
+    ),
+    ToolCallOutputMessage(
+        tool_call_id="call_1", tool_name="get_weather", content="Sunny"
+    ),
+    AssistantMessage(content="Sunny."),
+]
+
+
+class FakeHarmonyEncoding:
+    def __init__(self):
+        self.rendered: list[Conversation] = []
+
+    def render_conversation(self, conversation: Conversation) -> list[int]:
+        self.rendered.append(conversation)
+        return [1, 2, 3]
+
+    def decode(self, tokens) -> str:
+        return "<|start|>user<|message|>hi<|end|><|start|>assistant<|call|>"
+
+
+@pytest.fixture
+def fake_harmony_encoding(monkeypatch):
+    encoding = FakeHarmonyEncoding()
+    monkeypatch.setattr(harmony_module, "_harmony_encoding", encoding)
+    return encoding
+
+
+def test_harmony_conversation_same_as_dict_round_trip():
+    conversation = harmony_module.messages_to_harmony_conversation(
+        MESSAGES, conversation_start_date="2025-01-01"
+    )
+    round_trip = Conversation.from_json(
+        json.dumps(
+            harmony_module.messages_to_harmony(
+                MESSAGES, conversation_start_date="2025-01-01"
+            )
+        )
+    )
+    assert conversation.to_json() == round_trip.to_json()
+
+
+def test_harmony_tokens_and_str(fake_harmony_encoding):
+    tokens = harmony_module.messages_to_harmony_tokens(
+        MESSAGES, conversation_start_date="2025-01-01"
+    )
+    assert tokens == [1, 2, 3]
+    assert isinstance(fake_harmony_encoding.rendered[0], Conversation)
+
+    assert harmony_module.messages_to_harmony_str(MESSAGES) == (
+        "<|start|>user<|message|>hi<|end|>\n\n<|start|>assistant<|call|>"
+    )
+    assert harmony_module._tiktoken_encoding is None
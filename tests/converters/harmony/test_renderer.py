@@ -0,0 +1,134 @@
+import pytest
+from openai.types.shared.function_definition import FunctionDefinition
+
+from str_message import (
+    AssistantMessage,
+    ReasoningMessage,
+    SystemMessage,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+    UserMessage,
+)
+from str_message.utils import messages_to_harmony as harmony_module
+from tests.converters.harmony.test_token_array import FakeHarmonyEncoding
+
+GET_WEATHER = FunctionDefinition(
+    name="get_weather",
+    description="Get the weather of a city",
+    parameters={"type": "object", "properties": {"city": {"type": "string"}}},
+)
+
+
+@pytest.fixture(autouse=True)
+def fake_harmony_encoding(monkeypatch):
+    encoding = FakeHarmonyEncoding()
+    monkeypatch.setattr(harmony_module, "_harmony_encoding", encoding)
+    return encoding
+
+
+def _full_render(messages, renderer: harmony_module.HarmonyRenderer):
+    return harmony_module.messages_to_harmony_token_array(
+        messages,
+        reasoning_effort=renderer.reasoning_effort,
+        conversation_start_date=renderer.conversation_start_date,
+        tools=renderer.tools,
+    )
+
+
+def test_renderer_renders_appended_messages_only():
+    renderer = harmony_module.HarmonyRenderer(
+        conversation_start_date="2025-01-01", tools=[GET_WEATHER]
+    )
+    messages = [
+        SystemMessage(content="You are a taciturn assistant."),
+        UserMessage(content="What is the weather in Tokyo?"),
+    ]
+    assert renderer.render(messages) == _full_render(messages, renderer)
+
+    messages += [
+        ReasoningMessage(content="Need the weather tool."),
+        ToolCallMessage(
+            tool_call_id="call_1",
+            tool_name="get_weather",
+            tool_call_arguments='{"city": "Tokyo"}',
+        ),
+        ToolCallOutputMessage(
+            tool_call_id="call_1", tool_name="get_weather", content="Sunny"
+        ),
+    ]
+    assert renderer.render(messages) == _full_render(messages, renderer)
+    messages.append(AssistantMessage(content="Sunny."))
+    assert renderer.render(messages) == _full_render(messages, renderer)
+    assert renderer.render(messages) == _full_render(messages, renderer)
+
+    assert (renderer.full_renders, renderer.incremental_renders) == (1, 2)
+
+
+def test_renderer_falls_back_to_full_render():
+    renderer = harmony_module.HarmonyRenderer(conversation_start_date="2025-01-01")
+    messages = [UserMessage(content="Hi"), AssistantMessage(content="Hello.")]
+    renderer.render(messages)
+
+    # Edited earlier message
+    messages[1].content = "Hello!"
+    messages.append(UserMessage(content="Bye"))
+    assert renderer.render(messages) == _full_render(messages, renderer)
+    assert renderer.full_renders == 2
+
+    # Changed instructions
+    messages.append(SystemMessage(content="Be brief."))
+    assert renderer.render(messages) == _full_render(messages, renderer)
+    assert renderer.full_renders == 3
+
+    # Changed tools
+    renderer.tools = [GET_WEATHER]
+    assert renderer.render(messages) == _full_render(messages, renderer)
+    assert renderer.full_renders == 4
+
+    # Removed messages
+    assert renderer.render(messages[:2]) == _full_render(messages[:2], renderer)
+    assert (renderer.full_renders, renderer.incremental_renders) == (5, 0)
+
+
+def test_renderer_render_str(fake_harmony_encoding):
+    renderer = harmony_module.HarmonyRenderer(conversation_start_date="2025-01-01")
+    fake_harmony_encoding.decode = lambda tokens: "<|start|>user<|end|>"  # type: ignore  # noqa: E501
+
+    assert renderer.render_str([UserMessage(content="Hi")]) == "<|start|>user<|end|>"
+
+
+def test_renderer_matches_real_encoding(harmony_encoding):
+    renderer = harmony_module.HarmonyRenderer(
+        conversation_start_date="2025-01-01", tools=[GET_WEATHER]
+    )
+    turns = [
+        [
+            SystemMessage(content="You are a taciturn assistant."),
+            UserMessage(content="What is the weather in Tokyo?"),
+        ],
+        [ReasoningMessage(content="Need the weather tool.")],
+        [
+            ToolCallMessage(
+                tool_call_id="call_1",
+                tool_name="get_weather",
+                tool_call_arguments='{"city": "Tokyo"}',
+            ),
+            ToolCallOutputMessage(
+                tool_call_id="call_1", tool_name="get_weather", content="Sunny"
+            ),
+        ],
+        [ReasoningMessage(content="Answer briefly.")],
+        [AssistantMessage(content="Sunny.")],
+        [UserMessage(content="And Osaka?")],
+    ]
+
+    messages = []
+    for turn in turns:
+        messages += turn
+        conversation = harmony_module.messages_to_harmony_conversation(
+            messages, conversation_start_date="2025-01-01", tools=[GET_WEATHER]
+        )
+        assert list(renderer.render(messages).tokens) == (
+            harmony_encoding.render_conversation(conversation)
+        )
+    assert (renderer.full_renders, renderer.incremental_renders) == (1, 5)
@@ -0,0 +1,125 @@
+import array
+
+import pytest
+from openai_harmony import Conversation
+from openai_harmony import Message as HarmonyMessage
+
+from str_message import (
+    AssistantMessage,
+    ReasoningMessage,
+    SystemMessage,
+    UserMessage,
+)
+from str_message.utils import messages_to_harmony as harmony_module
+
+START = 9
+
+MESSAGES = [
+    SystemMessage(content="You are a taciturn assistant."),
+    UserMessage(content="Hi"),
+    ReasoningMessage(content="Say hello."),
+    AssistantMessage(content="Hello."),
+    UserMessage(content="Bye"),
+]
+
+
+class FakeHarmonyEncoding:
+    """Renders each message as <|start|> and one token per content character."""
+
+    def __init__(self, *, skip_empty_developer: bool = False):
+        self.skip_empty_developer = skip_empty_developer
+
+    def encode(self, text: str, allowed_special=()) -> list[int]:
+        assert text == "<|start|>"
+        return [START]
+
+    def render(self, message: HarmonyMessage, render_options=None) -> list[int]:
+        text = message.to_json()
+        if self.skip_empty_developer and '"developer_content"' in text:
+            if '"instructions"' not in text:
+                return []
+        return [START] + [100 + ord(c) % 50 for c in text[-12:]]
+
+    def render_conversation(self, conversation: Conversation) -> list[int]:
+        messages = conversation.messages
+        last_final = max(
+            (idx for idx, m in enumerate(messages) if m.channel == "final"),
+            default=-1,
+        )
+        tokens: list[int] = []
+        for idx, m in enumerate(messages):
+            if idx < last_final and m.channel == "analysis":
+                continue
+            tokens.extend(self.render(m))
+        return tokens
+
+
+@pytest.mark.parametrize("skip_empty_developer", [False, True])
+def test_harmony_token_array_spans(monkeypatch, skip_empty_developer):
+    encoding = FakeHarmonyEncoding(skip_empty_developer=skip_empty_developer)
+    monkeypatch.setattr(harmony_module, "_harmony_encoding", encoding)
+    messages = MESSAGES if not skip_empty_developer else MESSAGES[1:]
+
+    rendered = harmony_module.messages_to_harmony_token_array(
+        messages, conversation_start_date="2025-01-01"
+    )
+    conversation = harmony_module.messages_to_harmony_conversation(
+        messages, conversation_start_date="2025-01-01"
+    )
+
+    assert isinstance(rendered.tokens, array.array)
+    assert rendered.tokens.typecode == "I"
+    assert list(rendered.tokens) == encoding.render_conversation(conversation)
+
+    # The system message is merged into the developer header
+    offset = 0 if not skip_empty_developer else -1
+    assert [span.index for span in rendered.spans] == [
+        idx + offset for idx in (1, 2, 3, 4)
+    ]
+    assert rendered.header_end == rendered.spans[0].start
+    assert rendered.spans[-1].end == len(rendered.tokens)
+    for span, harmony_message in zip(rendered.spans, conversation.messages[2:]):
+        assert rendered.tokens[span.start : span.end].tolist() == (
+            encoding.render(harmony_message)
+        )
+
+
+def test_harmony_token_array_drops_analysis_before_final(monkeypatch):
+    encoding = FakeHarmonyEncoding()
+    monkeypatch.setattr(harmony_module, "_harmony_encoding", encoding)
+    conversation = Conversation.from_messages(
+        [
+            HarmonyMessage.from_role_and_content("user", "Hi"),  # type: ignore
+            HarmonyMessage.from_role_and_content(
+                "assistant", "Say hello."  # type: ignore
+            ).with_channel("analysis"),
+            HarmonyMessage.from_role_and_content(
+                "assistant", "Hello."  # type: ignore
+            ).with_channel("final"),
+        ]
+    )
+    tokens = array.array("I", encoding.render_conversation(conversation))
+
+    bounds = harmony_module._harmony_message_bounds(encoding, conversation, tokens)
+    assert bounds[1] is None
+    assert bounds[0] is not None and bounds[2] is not None
+    assert bounds[2][1] == len(tokens)
+
+
+def test_harmony_token_array_spans_real_encoding(harmony_encoding):
+    rendered = harmony_module.messages_to_harmony_token_array(
+        MESSAGES, conversation_start_date="2025-01-01"
+    )
+    conversation = harmony_module.messages_to_harmony_conversation(
+        MESSAGES, conversation_start_date="2025-01-01"
+    )
+    expected = harmony_encoding.render_conversation(conversation)
+
+    # Header and spans concatenate to the rendered tokens, gap free
+    assert list(rendered.tokens) == expected
+    tokens = rendered.tokens[: rendered.header_end].tolist()
+    for span in rendered.spans:
+        assert span.start == len(tokens)
+        tokens += rendered.tokens[span.start : span.end].tolist()
+    assert tokens == expected
+    assert [span.index for span in rendered.spans] == [1, 2, 3, 4]
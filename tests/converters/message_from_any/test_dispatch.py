@@ -0,0 +1,115 @@
+import pytest
+
+from str_message import (
+    AssistantMessage,
+    ResponseInputItemAdapter,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+)
+from str_message.utils.message_from_any import (
+    _message_from_dict_cascade,
+    dict_discriminator,
+    message_from_any,
+)
+from str_message.utils.message_from_response_input_item import (
+    message_from_response_input_item,
+)
+
+dict_items: list[dict] = [
+    {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 1,
+        "model": "gpt-4o-mini",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "Hello!"},
+            }
+        ],
+    },
+    {"role": "assistant", "content": "Hello!"},
+    {"role": "user", "content": "Hello!"},
+    {"role": "user", "content": [{"type": "input_text", "text": "Hello!"}]},
+    {"type": "message", "role": "user", "content": "Hello!"},
+    {
+        "id": "msg_1",
+        "type": "message",
+        "role": "assistant",
+        "status": "completed",
+        "content": [{"type": "output_text", "text": "Hello!", "annotations": []}],
+    },
+    {
+        "id": "fc_1",
+        "type": "function_call",
+        "call_id": "call_dispatch",
+        "name": "get_current_time",
+        "arguments": "{}",
+    },
+    {"type": "function_call_output", "call_id": "call_dispatch", "output": "noon"},
+    {"id": "rs_1", "type": "reasoning", "summary": []},
+]
+
+
+@pytest.mark.parametrize("data", dict_items)
+def test_dispatch_same_as_cascade(data: dict):
+    assert dict_discriminator(data) is not None
+
+    dispatched = message_from_any(data)
+    cascaded = _message_from_dict_cascade(data)
+
+    assert [type(m) for m in dispatched] == [type(m) for m in cascaded]
+    assert [m.content for m in dispatched] == [m.content for m in cascaded]
+
+
+def test_dispatch_tool_call_pair():
+    tool_call, tool_call_output = (
+        m
+        for item in dict_items
+        if item.get("call_id") == "call_dispatch"
+        for m in message_from_any(item)
+    )
+    assert isinstance(tool_call, ToolCallMessage)
+    assert isinstance(tool_call_output, ToolCallOutputMessage)
+    assert tool_call_output.tool_name == "get_current_time"
+
+
+def test_dispatch_output_only_item():
+    messages = message_from_any(
+        {
+            "id": "ig_1",
+            "type": "image_generation_call",
+            "status": "completed",
+            "result": None,
+        }
+    )
+    assert isinstance(messages[0], AssistantMessage)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"type": "message", "role": "user", "content": "Hello!"},
+        {"type": "message", "role": "developer", "content": "Be nice."},
+        {"type": "message", "role": "assistant", "content": "Hello!"},
+        {
+            "type": "message",
+            "role": "system",
+            "status": "completed",
+            "content": [{"type": "input_text", "text": "Be nice."}],
+        },
+        {"role": "user", "content": [{"type": "input_text", "text": "Hello!"}]},
+        dict_items[5],
+    ],
+)
+def test_dispatch_message_same_as_union(data: dict):
+    dispatched = message_from_any(data)
+    validated = message_from_response_input_item(
+        ResponseInputItemAdapter.validate_python(data)
+    )
+
+    assert [type(m) for m in dispatched] == [type(m) for m in validated]
+    assert [m.content for m in dispatched] == [m.content for m in validated]
+    if "id" in data:
+        assert [m.id for m in dispatched] == [m.id for m in validated]
@@ -0,0 +1,48 @@
+import io
+import json
+import pathlib
+
+import pytest
+
+from str_message import ToolCallMessage, ToolCallOutputMessage, UserMessage
+from str_message.utils.messages_from_jsonl import messages_gen_from_jsonl
+
+items: list[dict] = [
+    {"role": "user", "content": "What time is it in Tokyo?"},
+    {
+        "type": "function_call",
+        "call_id": "call_jsonl",
+        "name": "get_current_time",
+        "arguments": '{"timezone": "Asia/Tokyo"}',
+    },
+    {"type": "function_call_output", "call_id": "call_jsonl", "output": "noon"},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [None, 2, 100])
+def test_jsonl_file(tmp_path: pathlib.Path, chunk_size: int | None):
+    jsonl_path = tmp_path.joinpath("conversation.jsonl")
+    jsonl_path.write_text(
+        "\n".join(json.dumps(item) for item in items) + "\n\n", encoding="utf-8"
+    )
+
+    messages = list(messages_gen_from_jsonl(jsonl_path, chunk_size=chunk_size))
+
+    assert [type(m) for m in messages] == [
+        UserMessage,
+        ToolCallMessage,
+        ToolCallOutputMessage,
+    ]
+    assert messages[2].tool_name == "get_current_time"
+
+
+def test_jsonl_stream_is_lazy():
+    stream = io.BytesIO(
+        b"\n".join(json.dumps(item).encode() for item in items) + b"\nnot json\n"
+    )
+
+    messages_gen = messages_gen_from_jsonl(stream)
+    assert isinstance(next(messages_gen), UserMessage)
+
+    with pytest.raises(ValueError, match="line 4"):
+        list(messages_gen)
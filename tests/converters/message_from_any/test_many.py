@@ -0,0 +1,66 @@
+import pytest
+
+from str_message import (
+    AssistantMessage,
+    Message,
+    ReasoningMessage,
+    ToolCallMessage,
+    ToolCallOutputMessage,
+    UserMessage,
+)
+
+items: list = [
+    "Hello!",
+    {"role": "user", "content": "What time is it in Tokyo?"},
+    {"role": "user", "content": [{"type": "input_text", "text": "And in Taipei?"}]},
+    {"id": "rs_1", "type": "reasoning", "summary": []},
+    {
+        "id": "fc_1",
+        "type": "function_call",
+        "call_id": "call_many",
+        "name": "get_current_time",
+        "arguments": '{"timezone": "Asia/Tokyo"}',
+    },
+    {"type": "function_call_output", "call_id": "call_many", "output": "noon"},
+    {"type": "function_call_output", "call_id": "call_many"},  # Invalid, no output
+    {
+        "id": "msg_1",
+        "type": "message",
+        "role": "assistant",
+        "status": "completed",
+        "content": [{"type": "output_text", "text": "Noon.", "annotations": []}],
+    },
+]
+
+
+def test_from_many_keeps_order():
+    valid_items = [item for item in items if item != items[6]]
+    messages = Message.from_many(iter(valid_items))
+
+    assert [type(m) for m in messages] == [
+        Message,
+        UserMessage,
+        UserMessage,
+        ReasoningMessage,
+        ToolCallMessage,
+        ToolCallOutputMessage,
+        AssistantMessage,
+    ]
+    assert messages[2].content == "And in Taipei?"
+    assert isinstance(messages[5], ToolCallOutputMessage)
+    assert messages[5].tool_name == "get_current_time"
+
+
+def test_from_many_same_as_from_any():
+    valid_items = [item for item in items if item != items[6]]
+    many = Message.from_many(valid_items)
+    single = [m for item in valid_items for m in Message.from_any(item)]
+
+    assert [(type(m), m.content) for m in many] == [
+        (type(m), m.content) for m in single
+    ]
+
+
+def test_from_many_invalid_item():
+    with pytest.raises(ValueError, match="Unsupported message type"):
+        Message.from_many(items)
@@ -0,0 +1,39 @@
+from openai.types.responses.easy_input_message import EasyInputMessage
+from openai.types.responses.response_input_item import FunctionCallOutput, McpCall
+
+from str_message import McpCallMessage, ToolCallOutputMessage, UserMessage
+from str_message.types.chat_completion_messages import ChatCompletionUserMessage
+from str_message.utils.message_from_any import message_from_any
+
+
+def test_models_without_json_round_trip():
+    (user_message,) = message_from_any(EasyInputMessage(role="user", content="hi"))
+    assert isinstance(user_message, UserMessage)
+    assert user_message.content == "hi"
+
+    (chat_cmpl_user_message,) = message_from_any(
+        ChatCompletionUserMessage(role="user", content="hey")
+    )
+    assert isinstance(chat_cmpl_user_message, UserMessage)
+
+    (tool_call_output,) = message_from_any(
+        FunctionCallOutput(
+            call_id="call_models", output="noon", type="function_call_output"
+        )
+    )
+    assert isinstance(tool_call_output, ToolCallOutputMessage)
+
+
+def test_input_mcp_call_keeps_output():
+    (mcp_call,) = message_from_any(
+        McpCall(
+            id="mcp_1",
+            arguments="{}",
+            name="search_documentation",
+            server_label="aws-knowledge-mcp-server",
+            type="mcp_call",
+            output="S3 is an object storage service.",
+        )
+    )
+    assert isinstance(mcp_call, McpCallMessage)
+    assert mcp_call.content == "S3 is an object storage service."
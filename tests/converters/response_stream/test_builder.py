@@ -0,0 +1,141 @@
+import asyncio
+import typing
+
+import pydantic
+from openai.types.responses.response_stream_event import ResponseStreamEvent
+
+from str_message import AssistantMessage, ReasoningMessage, ToolCallMessage
+from str_message.types.response_stream_builder import ResponseStreamBuilder
+from str_message.types.tool_call_registry import (
+    TTLToolCallRegistry,
+    use_tool_call_registry,
+)
+
+ResponseStreamEventAdapter = pydantic.TypeAdapter[ResponseStreamEvent](
+    ResponseStreamEvent
+)
+
+MESSAGE_ITEM = {
+    "id": "msg_1",
+    "type": "message",
+    "role": "assistant",
+    "status": "completed",
+    "content": [{"type": "output_text", "text": "Sunny in Tokyo", "annotations": []}],
+}
+FUNCTION_CALL_ITEM = {
+    "id": "fc_1",
+    "type": "function_call",
+    "call_id": "call_1",
+    "name": "get_weather",
+    "arguments": '{"city": "Tokyo"}',
+    "status": "completed",
+}
+REASONING_ITEM = {
+    "id": "rs_1",
+    "type": "reasoning",
+    "summary": [{"type": "summary_text", "text": "Check the weather"}],
+}
+
+
+def _events() -> typing.List[ResponseStreamEvent]:
+    events: typing.List[typing.Dict[str, typing.Any]] = [
+        {
+            "type": "response.output_item.added",
+            "output_index": 0,
+            "item": {**REASONING_ITEM, "summary": []},
+        },
+        {
+            "type": "response.reasoning_summary_text.delta",
+            "output_index": 0,
+            "item_id": "rs_1",
+            "summary_index": 0,
+            "delta": "Check the weather",
+        },
+        {
+            "type": "response.output_item.done",
+            "output_index": 0,
+            "item": REASONING_ITEM,
+        },
+        {
+            "type": "response.output_item.added",
+            "output_index": 1,
+            "item": {**FUNCTION_CALL_ITEM, "arguments": "", "status": "in_progress"},
+        },
+    ]
+    events += [
+        {
+            "type": "response.function_call_arguments.delta",
+            "output_index": 1,
+            "item_id": "fc_1",
+            "delta": delta,
+        }
+        for delta in ('{"city": ', '"Tokyo"}')
+    ]
+    events += [
+        {
+            "type": "response.output_item.done",
+            "output_index": 1,
+            "item": FUNCTION_CALL_ITEM,
+        },
+        {
+            "type": "response.output_item.added",
+            "output_index": 2,
+            "item": {**MESSAGE_ITEM, "content": [], "status": "in_progress"},
+        },
+    ]
+    events += [
+        {
+            "type": "response.output_text.delta",
+            "output_index": 2,
+            "item_id": "msg_1",
+            "content_index": 0,
+            "delta": delta,
+            "logprobs": [],
+        }
+        for delta in ("Sunny", " in Tokyo")
+    ]
+    events += [
+        {"type": "response.output_item.done", "output_index": 2, "item": MESSAGE_ITEM},
+    ]
+    return [
+        ResponseStreamEventAdapter.validate_python({**event, "sequence_number": idx})
+        for idx, event in enumerate(events)
+    ]
+
+
+def test_yields_each_item_when_done():
+    builder = ResponseStreamBuilder()
+    registry = TTLToolCallRegistry()
+    done: typing.List[typing.List[type]] = []
+    with use_tool_call_registry(registry):
+        for event in _events():
+            if messages := builder.add(event):
+                done.append([type(m) for m in messages])
+
+    assert done == [[ReasoningMessage], [ToolCallMessage], [AssistantMessage]]
+    assert registry.get("call_1") is not None
+
+
+def test_partial_messages_match_done_items():
+    builder = ResponseStreamBuilder()
+    for event in _events():
+        if event.type == "response.output_item.done":
+            (partial,) = builder.partial_messages(event.output_index)
+            (done,) = builder.add(event)
+            assert type(partial) is type(done)
+            assert partial.content == done.content
+        else:
+            builder.add(event)
+    assert builder.partial_messages(0) == []
+
+
+def test_messages_gen():
+    async def events():
+        for event in _events():
+            yield event
+
+    async def collect():
+        return [m async for m in ResponseStreamBuilder().messages_gen(events())]
+
+    messages = asyncio.run(collect())
+    assert [m.id for m in messages] == ["rs_1", "call_1", "msg_1"]
@@ -0,0 +1,243 @@
+from openai.types.responses.response_function_tool_call import ResponseFunctionToolCall
+
+from str_message import Conversation, Message, ToolCallOutputMessage
+from str_message.types.tool_call_registry import (
+    ShardedToolCallRegistry,
+    SQLiteToolCallRegistry,
+    TTLToolCallRegistry,
+    get_tool_call_registry,
+    use_tool_call_registry,
+)
+
+
+def _function_call(call_id: str) -> ResponseFunctionToolCall:
+    return ResponseFunctionToolCall(
+        call_id=call_id,
+        name="get_weather",
+        arguments='{"city": "Tokyo"}',
+        type="function_call",
+    )
+
+
+def _function_call_output(call_id: str) -> dict:
+    return {"type": "function_call_output", "call_id": call_id, "output": "Sunny"}
+
+
+def test_registry_counts_hits_misses_and_evictions():
+    now = [0.0]
+    registry = TTLToolCallRegistry(maxsize=2, ttl=10, timer=lambda: now[0])
+
+    registry.set("call_1", _function_call("call_1"))
+    registry.set("call_2", _function_call("call_2"))
+    registry.set("call_3", _function_call("call_3"))  # Evicts call_1
+    assert registry.get("call_1") is None
+    assert registry.get("call_3") is not None
+
+    now[0] = 11.0  # call_2 and call_3 expire
+    assert registry.get("call_2") is None
+    assert registry.stats == (1, 2, 3, 0)
+
+
+def test_scoped_registry_keeps_tool_calls_apart():
+    default_registry = get_tool_call_registry()
+    conv = Conversation()
+
+    with conv.tool_call_scope() as registry:
+        assert get_tool_call_registry() is registry
+        conv.add_message(Message.from_any(_function_call("call_scoped")))
+        (output,) = Message.from_any(_function_call_output("call_scoped"))
+
+    assert get_tool_call_registry() is default_registry
+    assert default_registry.get("call_scoped") is None
+    assert isinstance(output, ToolCallOutputMessage)
+    assert output.tool_name == "get_weather"
+    assert conv.tool_call_registry.hits == 1
+
+
+def test_use_tool_call_registry_restores_previous():
+    outer, inner = TTLToolCallRegistry(), TTLToolCallRegistry()
+    with use_tool_call_registry(outer):
+        with use_tool_call_registry(inner):
+            Message.set_tool_call("call_1", _function_call("call_1"))
+        assert get_tool_call_registry() is outer
+    assert len(inner) == 1 and len(outer) == 0
+
+
+def test_sharded_registry_from_threads():
+    import concurrent.futures
+
+    registry = ShardedToolCallRegistry(maxsize=10_000, shards=8)
+
+    def work(worker: int) -> int:
+        found = 0
+        for idx in range(500):
+            call_id = f"call_{worker}_{idx}"
+            registry.set(call_id, _function_call(call_id))
+            found += registry.get(call_id) is not None
+        return found
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        assert sum(executor.map(work, range(8))) == 8 * 500
+
+    assert registry.stats == (8 * 500, 0, 0, 8 * 500)
+
+
+def test_sharded_registry_holds_maxsize():
+    import uuid
+
+    registry = ShardedToolCallRegistry(maxsize=1000, shards=16)
+    for _ in range(1000):
+        call_id = f"call_{uuid.uuid4().hex}"
+        registry.set(call_id, _function_call(call_id))
+    assert registry.evictions == 0
+    assert len(registry) == 1000
+
+    # Full shards still evict
+    for idx in range(2000):
+        registry.set(f"call_{idx}", _function_call(f"call_{idx}"))
+    assert registry.evictions > 0
+
+
+def test_registry_counts_from_threads(tmp_path):
+    import concurrent.futures
+    import sys
+
+    registry = SQLiteToolCallRegistry(tmp_path / "tool_calls.db")
+    registry.set("call_1", _function_call("call_1"))
+
+    def work(worker: int) -> None:
+        for idx in range(2000):
+            registry.get("call_1" if idx % 2 else f"call_{worker}_{idx}")
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(work, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+        registry.close()
+
+    assert (registry.hits, registry.misses) == (8 * 1000, 8 * 1000)
+
+
+def test_default_registry_holds_maxsize():
+    registry = get_tool_call_registry()
+    assert isinstance(registry, ShardedToolCallRegistry)
+    assert len(registry._shards) > 1
+    registry.clear()
+    evictions = registry.evictions
+    for idx in range(registry.maxsize):
+        registry.set(f"default_{idx}", _function_call(f"default_{idx}"))
+    assert registry.evictions == evictions
+    registry.clear()
+
+
+def test_sqlite_registry_batches_writes(tmp_path):
+    path = tmp_path.joinpath("tool_calls.db")
+    writer = SQLiteToolCallRegistry(path, batch_size=2, flush_interval=60)
+    reader = SQLiteToolCallRegistry(path)
+
+    writer.set("call_1", _function_call("call_1"))
+    assert writer.get("call_1") is not None  # Pending calls are seen locally
+    assert reader.get("call_1") is None
+
+    writer.set("call_2", _function_call("call_2"))
+    assert reader.get("call_1") == _function_call("call_1")
+    assert reader.stats == (1, 1, 0, 2)
+
+
+def test_sqlite_registry_expires_and_evicts(tmp_path):
+    now = [0.0]
+    registry = SQLiteToolCallRegistry(
+        tmp_path.joinpath("tool_calls.db"),
+        maxsize=2,
+        ttl=10,
+        batch_size=1,
+        timer=lambda: now[0],
+    )
+    for idx in range(3):
+        registry.set(f"call_{idx}", _function_call(f"call_{idx}"))
+    assert registry.get("call_0") is None
+    assert registry.evictions == 1
+
+    now[0] = 11.0
+    assert registry.get("call_2") is None
+    assert len(registry) == 0
+
+
+def _set_in_worker(registry: SQLiteToolCallRegistry, call_id: str) -> None:
+    with use_tool_call_registry(registry):
+        Message.from_any(_function_call(call_id))
+
+
+def test_sqlite_registry_across_processes(tmp_path):
+    import concurrent.futures
+
+    registry = SQLiteToolCallRegistry(
+        tmp_path.joinpath("tool_calls.db"), flush_interval=60
+    )
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        list(executor.map(_set_in_worker, [registry] * 4, ["a", "b", "c", "d"]))
+
+    # Pending writes are flushed as the workers exit
+    with use_tool_call_registry(registry):
+        (output,) = Message.from_any(_function_call_output("c"))
+    assert output.tool_name == "get_weather"
+
+
+def _tool_name_in_worker(
+    registry: SQLiteToolCallRegistry, call_id: str, wait: float = 0.0
+) -> str:
+    import time
+
+    deadline = time.monotonic() + wait
+    with use_tool_call_registry(registry):
+        while True:
+            (output,) = Message.from_any(_function_call_output(call_id))
+            if output.tool_name == "get_weather" or time.monotonic() > deadline:
+                return output.tool_name
+            time.sleep(0.01)
+
+
+def test_sqlite_registry_across_running_workers(tmp_path):
+    import concurrent.futures
+
+    registry = SQLiteToolCallRegistry(tmp_path.joinpath("tool_calls.db"))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=2) as executor:
+        # Same worker, the unpickled registry shares one write buffer
+        single = concurrent.futures.ProcessPoolExecutor(max_workers=1)
+        with single:
+            single.submit(_set_in_worker, registry, "same").result()
+            assert single.submit(_tool_name_in_worker, registry, "same").result() == (
+                "get_weather"
+            )
+
+        # Other workers, committed by the flush timer while workers keep running
+        list(executor.map(_set_in_worker, [registry] * 4, ["a", "b", "c", "d"]))
+        names = executor.map(
+            _tool_name_in_worker, [registry] * 4, ["a", "b", "c", "d"], [5.0] * 4
+        )
+        assert list(names) == ["get_weather"] * 4
+        assert registry.get("same") is not None
+
+
+def test_sqlite_registry_unpickles_to_open_instance(tmp_path):
+    import pickle
+
+    registry = SQLiteToolCallRegistry(tmp_path.joinpath("tool_calls.db"))
+    assert pickle.loads(pickle.dumps(registry)) is registry
+
+
+def test_sqlite_registry_flushes_on_timer(tmp_path):
+    import time
+
+    path = tmp_path.joinpath("tool_calls.db")
+    writer = SQLiteToolCallRegistry(path, flush_interval=0.02)
+    reader = SQLiteToolCallRegistry(path)
+
+    writer.set("call_1", _function_call("call_1"))  # No further sets
+    deadline = time.monotonic() + 5.0
+    while reader.get("call_1") is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert reader.get("call_1") is not None
@@ -0,0 +1,26 @@
+import subprocess
+import sys
+
+import str_message
+
+
+def test_import_defers_heavy_modules():
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, str_message; "
+            + "print(','.join(m for m in ('agents', 'jinja2', 'openai_usage', "
+            + "'str_message._adapters') if m in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
+
+
+def test_all_names_available():
+    for name in str_message.__all__:
+        assert getattr(str_message, name) is not None
+    assert set(str_message.__all__) <= set(dir(str_message))
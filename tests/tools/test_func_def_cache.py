@@ -0,0 +1,52 @@
+import json
+
+from str_message.extra.func_defs import func_def_get_current_weather
+
+
+def test_tool_params_are_built_once():
+    func_def = func_def_get_current_weather()
+
+    assert func_def.parameters == func_def.parameters
+    assert func_def._parameters is func_def._parameters
+    assert func_def._chat_cmpl_tool_param is func_def._chat_cmpl_tool_param
+    assert func_def._response_tool_param is func_def._response_tool_param
+    assert func_def.agents_tool is func_def.agents_tool
+
+
+def test_mutating_tool_params_does_not_leak():
+    func_def = func_def_get_current_weather()
+    chat_cmpl_json = func_def.chat_cmpl_tool_param_json
+    response_json = func_def.response_tool_param_json
+
+    func_def.parameters["required"].append("MUTATED")
+    func_def.chat_cmpl_tool_param["function"]["parameters"]["MUTATED"] = True
+    func_def.response_tool_param["parameters"]["properties"].clear()
+    func_def.agents_tool.params_json_schema["MUTATED"] = True
+
+    assert func_def.parameters["required"] == ["city"]
+    assert json.loads(chat_cmpl_json) == func_def.chat_cmpl_tool_param
+    assert json.loads(response_json) == func_def.response_tool_param
+    assert func_def.chat_cmpl_tool_param_json == chat_cmpl_json
+    assert func_def.response_tool_param_json == response_json
+
+
+def test_parameters_do_not_change_func_def():
+    func_def = func_def_get_current_weather()
+    original = json.dumps(func_def.func_def.parameters, sort_keys=True)
+
+    assert func_def.parameters["additionalProperties"] is False
+    assert func_def.parameters["required"] == ["city"]
+    assert json.dumps(func_def.func_def.parameters, sort_keys=True) == original
+
+
+def test_json_bytes_and_invalidation():
+    func_def = func_def_get_current_weather()
+    assert json.loads(func_def.chat_cmpl_tool_param_json) == (
+        func_def.chat_cmpl_tool_param
+    )
+    assert json.loads(func_def.response_tool_param_json)["strict"] is True
+
+    func_def.strict = False
+    assert func_def.chat_cmpl_tool_param["function"]["strict"] is False
+    assert json.loads(func_def.response_tool_param_json)["strict"] is False
+    assert func_def.agents_tool.strict_json_schema is False
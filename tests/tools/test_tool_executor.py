@@ -0,0 +1,151 @@
+import asyncio
+import threading
+import time
+
+import pydantic
+import pytest
+from openai.types.shared.function_definition import FunctionDefinition
+
+from str_message import Conversation, ToolCallMessage, UserMessage
+from str_message.types.func_def import FuncDef
+from str_message.types.tool_executor import ToolExecutor
+
+
+class Arguments(pydantic.BaseModel):
+    value: str = ""
+
+
+def _func_def(name: str, callable) -> FuncDef:
+    return FuncDef(FunctionDefinition(name=name), callable, Arguments)
+
+
+def _tool_call(call_id: str, name: str, value: str = "") -> ToolCallMessage:
+    return ToolCallMessage(
+        tool_call_id=call_id,
+        tool_name=name,
+        tool_call_arguments=Arguments(value=value).model_dump_json(),
+    )
+
+
+async def echo(arguments: str) -> str:
+    value = Arguments.model_validate_json(arguments).value
+    await asyncio.sleep(0.05 if value == "slow" else 0)
+    return value
+
+
+def test_runs_concurrently_in_call_order():
+    executor = ToolExecutor([_func_def("echo", echo)])
+    tool_calls = [
+        _tool_call("call_1", "echo", "slow"),
+        _tool_call("call_2", "echo", "b"),
+    ]
+
+    started = time.perf_counter()
+    outputs = asyncio.run(executor.run(tool_calls * 5))
+    assert time.perf_counter() - started < 0.05 * 5
+    assert [o.content for o in outputs] == ["slow", "b"] * 5
+    assert [o.tool_call_id for o in outputs] == ["call_1", "call_2"] * 5
+
+
+def test_concurrency_limit_per_tool():
+    running, peak = 0, 0
+
+    async def counted(arguments: str) -> str:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return "ok"
+
+    executor = ToolExecutor([_func_def("counted", counted)], concurrency={"counted": 2})
+    calls = [_tool_call(f"call_{idx}", "counted") for idx in range(6)]
+    assert [o.content for o in asyncio.run(executor.run(calls))] == ["ok"] * 6
+    assert peak == 2
+
+
+def test_timeout_and_errors_become_outputs():
+    async def hang(arguments: str) -> str:
+        await asyncio.sleep(10)
+        return "never"
+
+    async def fail(arguments: str) -> str:
+        raise ValueError("bad arguments")
+
+    async def upstream_timeout(arguments: str) -> str:
+        raise TimeoutError("upstream timed out")
+
+    executor = ToolExecutor(
+        [
+            _func_def("hang", hang),
+            _func_def("fail", fail),
+            _func_def("upstream", upstream_timeout),
+        ],
+        timeouts={"hang": 0.01},
+        timeout=10,
+    )
+    outputs = asyncio.run(
+        executor.run(
+            [
+                _tool_call("call_1", "hang"),
+                _tool_call("call_2", "fail"),
+                _tool_call("call_3", "missing"),
+                _tool_call("call_4", "upstream"),
+            ]
+        )
+    )
+    assert [o.content for o in outputs] == [
+        "Error: Tool 'hang' timed out after 0.01s",
+        "Error: ValueError: bad arguments",
+        "Error: Tool 'missing' not found",
+        "Error: TimeoutError: upstream timed out",
+    ]
+
+
+def test_cancel_run_cancels_calls():
+    async def main():
+        cancelled = asyncio.Event()
+
+        async def hang(arguments: str) -> str:
+            try:
+                await asyncio.sleep(10)
+            finally:
+                cancelled.set()
+            return "never"
+
+        executor = ToolExecutor([_func_def("hang", hang)])
+        task = asyncio.create_task(executor.run([_tool_call("call_1", "hang")]))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return cancelled.is_set()
+
+    assert asyncio.run(main())
+
+
+def test_sync_callables_run_in_threads():
+    def blocking(arguments: str) -> str:
+        time.sleep(0.05)
+        return threading.current_thread().name
+
+    executor = ToolExecutor([_func_def("blocking", blocking)])
+    calls = [_tool_call(f"call_{idx}", "blocking") for idx in range(4)]
+
+    started = time.perf_counter()
+    outputs = asyncio.run(executor.run(calls))
+    assert time.perf_counter() - started < 0.05 * 4
+    assert threading.main_thread().name not in {o.content for o in outputs}
+
+
+def test_run_conversation_adds_outputs():
+    conv = Conversation(messages=[UserMessage(content="Echo a and b")])
+    conv.add_message(
+        [_tool_call("call_1", "echo", "a"), _tool_call("call_2", "echo", "b")]
+    )
+
+    outputs = asyncio.run(
+        ToolExecutor([_func_def("echo", echo)]).run_conversation(conv)
+    )
+    assert conv.messages[-2:] == outputs
+    assert conv.pending_tool_calls() == []